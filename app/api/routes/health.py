@@ -1,31 +1,68 @@
-from fastapi import APIRouter, Response
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from loguru import logger
-from typing import Dict
+from typing import Dict, Tuple
+import asyncio
+import time
 
 from app.core.db import db
+from app.core.telegram import bot_instance
+from app.services.cache_service import CacheService
 
 router = APIRouter()
+cache = CacheService()
+
+DB_CHECK_TIMEOUT = 1.0  # seconds
+HEALTH_CACHE_KEY = "health_status"
+HEALTH_CACHE_TTL = 5  # Serve repeat probes from cache for 5 seconds
+DB_STALE_TTL = 10  # Report "stale" instead of failing for this long after the last good ping
+
+_last_db_ok: float = 0.0
+
+async def _check_db() -> Tuple[str, str]:
+    """Ping the long-lived database connection opened at startup"""
+    global _last_db_ok
+    try:
+        await asyncio.wait_for(db.prisma.query_raw("SELECT 1"), timeout=DB_CHECK_TIMEOUT)
+        _last_db_ok = time.monotonic()
+        return "database", "healthy"
+    except Exception as e:
+        logger.error(f"Database health check failed: {e}")
+        # Ride out brief blips rather than flapping the probe
+        if _last_db_ok and time.monotonic() - _last_db_ok < DB_STALE_TTL:
+            return "database", "stale"
+        return "database", "unhealthy"
+
+async def _check_telegram() -> Tuple[str, str]:
+    """Check that the Telegram application is up and running"""
+    try:
+        application = bot_instance.application
+        if application and application.running:
+            return "telegram", "healthy"
+    except Exception as e:
+        logger.error(f"Telegram health check failed: {e}")
+    return "telegram", "unhealthy"
 
 @router.get("")
 async def health_check() -> Dict:
     """Check system health status"""
+    # Only healthy results are cached, so an outage is reported on the next probe
+    cached_status = await cache.get_key(HEALTH_CACHE_KEY)
+    if cached_status:
+        return cached_status
+
+    # Sub-checks are independent, so run them concurrently
+    results = await asyncio.gather(_check_db(), _check_telegram())
     status = {
         "status": "healthy",
-        "services": {
-            "database": "unhealthy",
-        }
+        "services": dict(results)
     }
 
-    try:
-        # Check database connection
-        await db.connect()
-        await db.disconnect()
-        status["services"]["database"] = "healthy"
-    except Exception as e:
-        logger.error(f"Database health check failed: {e}")
     # Set overall status
     if any(v == "unhealthy" for v in status["services"].values()):
         status["status"] = "unhealthy"
-        return Response(status_code=503, content=status)
+        return ORJSONResponse(status_code=503, content=status)
 
-    return status 
\ No newline at end of file
+    if all(v == "healthy" for v in status["services"].values()):
+        await cache.set_key(HEALTH_CACHE_KEY, status, expiry=HEALTH_CACHE_TTL)
+    return status
\ No newline at end of file
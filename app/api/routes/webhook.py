@@ -1,12 +1,27 @@
-from fastapi import APIRouter, Response
+from fastapi import APIRouter, Request, Response
 from loguru import logger
+import orjson
+
+from app.core.telegram import bot_instance
+from env import env
 
 router = APIRouter()
 
 @router.post("")
-async def telegram_webhook():
-    """Placeholder route - Bot is using polling mode"""
-    return Response(
-        status_code=400,
-        content="Bot is configured to use polling mode. Webhook endpoints are disabled."
-    )
\ No newline at end of file
+async def telegram_webhook(request: Request):
+    """Receive updates from Telegram when the bot runs in webhook mode"""
+    if not env.USE_WEBHOOK:
+        return Response(
+            status_code=400,
+            content="Bot is configured to use polling mode. Webhook endpoints are disabled."
+        )
+
+    if env.WEBHOOK_SECRET and request.headers.get("X-Telegram-Bot-Api-Secret-Token") != env.WEBHOOK_SECRET:
+        return Response(status_code=403)
+
+    try:
+        await bot_instance.process_webhook_update(orjson.loads(await request.body()))
+    except Exception as e:
+        logger.error(f"Error processing webhook update: {e}")
+    # Always acknowledge so Telegram does not redeliver the update
+    return Response(status_code=200)
\ No newline at end of file
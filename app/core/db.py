@@ -1,33 +1,22 @@
 from prisma import Prisma
 from typing import Optional, Any, Dict, List
 from loguru import logger
-import asyncio
 from datetime import datetime
 
-class Database:
-    _instance: Optional['Database'] = None
-    _lock = asyncio.Lock()
-    _initialized = False
-    
-    def __new__(cls):
-        if not cls._instance:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+from env import env
 
+class Database:
     def __init__(self):
-        if not self._initialized:
-            self.prisma = Prisma()
-            self._initialized = True
-    
+        # Use the pool-tuned URL rather than the raw DATABASE_URL from the environment
+        self.prisma = Prisma(datasource={"url": env.DATABASE_URL})
+
     async def connect(self):
-        """Connect to the database"""
-        if not self.prisma.is_connected():
-            await self.prisma.connect()
+        """Connect to the database (called once from the app lifespan)"""
+        await self.prisma.connect()
     
     async def disconnect(self):
-        """Disconnect from the database"""
-        if self.prisma.is_connected():
-            await self.prisma.disconnect()
+        """Disconnect from the database (called once from the app lifespan)"""
+        await self.prisma.disconnect()
     
     async def execute_raw(self, query: str, *args):
         """Execute a raw SQL query"""
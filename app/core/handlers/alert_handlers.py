@@ -1,48 +1,73 @@
-from telegram import Update, Message
+from telegram import Update
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 from loguru import logger
-from typing import Optional
 
-# Assume alert_service and price_service are available via context or passed as arguments
-async def _send_loading_message(update: Update) -> Optional[Message]:
-    """Send a loading message and return it for later deletion"""
-    try:
-        return await update.message.reply_text("⏳ Processing your request...")
-    except Exception as e:
-        logger.error(f"Error sending loading message: {e}")
-        return None
+from app.core.handlers.price_handlers import show_typing, UPSTREAM_ERRORS
 
-async def _delete_message_safe(message: Optional[Message]):
-    """Safely delete a message"""
-    if message:
-        try:
-            await message.delete()
-        except Exception as e:
-            logger.error(f"Error deleting message: {e}")
+# Single-pass escape table for service error text (which can echo user input)
+# sent with the legacy Markdown parse mode
+_MD_ESCAPE = str.maketrans({'[': '\\[', '*': '\\*', '_': '\\_', '`': '\\`'})
+
+# Progress bar pieces for /alerts, sliced per alert instead of rebuilt
+_BAR_WIDTH = 20
+_FULL_BAR = "█" * _BAR_WIDTH
+_EMPTY_BAR = "░" * _BAR_WIDTH
+
+# /alerts page layout
+_ALERTS_HEADER = "🔔 *Your Alerts* 🔔\n\n"
+_ALERTS_SEPARATOR = "\n\n" + "━" * 80 + "\n\n"
+_ALERTS_FOOTER = "\n\nUse `/delalert <id>` to remove an alert."
+
+# Static replies, built once
+_SETALERT_USAGE = (
+    "🔔 *Set Price Alert* 🔔\n\n"
+    "*Usage:* `/setalert <symbol> <price> <above|below>`\n"
+    "*Example:* `/setalert BTC 50000 above`\n\n"
+    "*Parameters:*\n"
+    "• `<symbol>` - Cryptocurrency symbol (e.g., BTC, ETH)\n"
+    "• `<price>` - Target price to be notified at\n"
+    "• `<above|below>` - Whether to alert when price goes above or below the target\n\n"
+    "*Example Usage:*\n"
+    "• `/setalert BTC 50000 above` - Alert when BTC goes above $50,000\n"
+    "• `/setalert ETH 2000 below` - Alert when ETH drops below $2,000"
+)
 
-async def set_alert_command(update: Update, context: ContextTypes.DEFAULT_TYPE, alert_service_instance, price_service_instance):
+_NO_ALERTS_MESSAGE = (
+    "🔕 *No Active Alerts*\n\n"
+    "You don't have any active price alerts.\n"
+    "Use `/setalert <symbol> <price> <above|below>` to create one!"
+)
+
+# Success replies, filled with str.format_map per call
+_ALERT_SET_TMPL = (
+    "✅ *Alert Set Successfully* ✅\n\n"
+    "• *Symbol:* {symbol}\n"
+    "• *Condition:* Price {condition} ${target_price:,.2f}\n"
+    "• *Current Price:* ${current_price:,.2f} ({price_diff:+.2f}%)"
+)
+
+_ALERT_DELETED_TMPL = (
+    "🗑 *Alert Deleted* ✅\n\n"
+    "• *Symbol:* {symbol}\n"
+    "• *Condition:* Price {condition} ${target_price:,.2f}\n"
+    "• *Alert ID:* `{alert_id}`"
+)
+
+_DELALERT_USAGE = (
+    "🗑 *Delete Alert* 🗑\n\n"
+    "*Usage:* `/delalert <alert_id>`\n"
+    "*Example:* `/delalert 12345`\n\n"
+    "Use `/alerts` to see your active alerts and their IDs."
+)
+
+async def set_alert_command(update: Update, context: ContextTypes.DEFAULT_TYPE, alert_service_instance):
     """Handle /setalert command with improved validation and feedback"""
-    loading_msg = await _send_loading_message(update)
-    
     try:
         # Show help if no arguments provided
         if not context.args or len(context.args) < 3:
-            help_text = (
-                "🔔 *Set Price Alert* 🔔\n\n"
-                "*Usage:* `/setalert <symbol> <price> <above|below>`\n"
-                "*Example:* `/setalert BTC 50000 above`\n\n"
-                "*Parameters:*\n"
-                "• `<symbol>` - Cryptocurrency symbol (e.g., BTC, ETH)\n"
-                "• `<price>` - Target price to be notified at\n"
-                "• `<above|below>` - Whether to alert when price goes above or below the target\n\n"
-                "*Example Usage:*\n"
-                "• `/setalert BTC 50000 above` - Alert when BTC goes above $50,000\n"
-                "• `/setalert ETH 2000 below` - Alert when ETH drops below $2,000"
-            )
-            await _delete_message_safe(loading_msg)
             await update.message.reply_text(
-                help_text,
+                _SETALERT_USAGE,
                 parse_mode=ParseMode.MARKDOWN,
                 disable_web_page_preview=True
             )
@@ -68,7 +93,6 @@ async def set_alert_command(update: Update, context: ContextTypes.DEFAULT_TYPE,
             else:
                 error_msg = "❌ Invalid input. Please check your values and try again."
             
-            await _delete_message_safe(loading_msg)
             await update.message.reply_text(
                 f"{error_msg}\n\n"
                 "*Example:* `/setalert BTC 50000 above`",
@@ -76,6 +100,9 @@ async def set_alert_command(update: Update, context: ContextTypes.DEFAULT_TYPE,
             )
             return
 
+        # Input is valid; show the typing indicator while the alert is saved
+        show_typing(update, context)
+
         # Set the alert
         result = await alert_service_instance.set_alert(
             user_id=update.effective_user.id,
@@ -90,34 +117,35 @@ async def set_alert_command(update: Update, context: ContextTypes.DEFAULT_TYPE,
             if 'duplicate' in error_msg.lower():
                 response = "ℹ️ You already have a similar alert set."
             else:
-                response = f"❌ {error_msg}"
+                response = f"❌ {error_msg.translate(_MD_ESCAPE)}"
             
-            await _delete_message_safe(loading_msg)
             await update.message.reply_text(
                 response,
                 parse_mode=ParseMode.MARKDOWN
             )
         else:
-            # Get current price for feedback
-            current_price = await price_service_instance.get_current_price(symbol)
-            price_diff = ((current_price - price) / price * 100) if current_price else 0
+            # The service already fetched the current price to create the alert
+            current_price = result['current_price']
+            price_diff = (current_price - price) / price * 100
             
-            response = (
-                f"✅ *Alert Set Successfully* ✅\n\n"
-                f"• *Symbol:* {symbol}\n"
-                f"• *Condition:* Price {condition.upper()} ${price:,.2f}\n"
-                f"• *Current Price:* ${current_price:,.2f} ({price_diff:+.2f}%)"
-            )
+            response = _ALERT_SET_TMPL.format_map({
+                'symbol': symbol,
+                'condition': condition.upper(),
+                'target_price': price,
+                'current_price': current_price,
+                'price_diff': price_diff
+            })
             
-            await _delete_message_safe(loading_msg)
             await update.message.reply_text(
                 response,
                 parse_mode=ParseMode.MARKDOWN
             )
             
     except Exception as e:
-        logger.error(f"Error in set_alert_command: {e}")
-        await _delete_message_safe(loading_msg)
+        if isinstance(e, UPSTREAM_ERRORS):
+            logger.warning("Upstream failure in set_alert_command: {}", e)
+        else:
+            logger.exception("Error in set_alert_command: {}", e)
         await update.message.reply_text(
             "❌ An error occurred while setting the alert. Please try again.",
             parse_mode=ParseMode.MARKDOWN
@@ -125,32 +153,30 @@ async def set_alert_command(update: Update, context: ContextTypes.DEFAULT_TYPE,
 
 async def list_alerts_command(update: Update, context: ContextTypes.DEFAULT_TYPE, alert_service_instance, price_service_instance):
     """Handle /alerts command with improved formatting and current prices"""
-    loading_msg = await _send_loading_message(update)
-    
     try:
+        show_typing(update, context)
+
         # Get user's alerts
         alerts = await alert_service_instance.get_user_alerts(update.effective_user.id)
         
         if not alerts:
-            no_alerts_msg = (
-                "🔕 *No Active Alerts*\n\n"
-                "You don't have any active price alerts.\n"
-                "Use `/setalert <symbol> <price> <above|below>` to create one!"
-            )
             await update.message.reply_text(
-                no_alerts_msg,
+                _NO_ALERTS_MESSAGE,
                 parse_mode=ParseMode.MARKDOWN
             )
             return
         
-        # Get unique symbols to fetch current prices
-        symbols = list({alert['symbol'].upper() for alert in alerts})
-        current_prices = await price_service_instance.get_prices(symbols)
+        # Use cached prices for the alerts' symbols; only fetch the rest
+        upper_symbols = [alert['symbol'].upper() for alert in alerts]
+        unique_symbols = list(set(upper_symbols))
+        current_prices = await price_service_instance.get_cached_prices(unique_symbols)
+        symbols = [symbol for symbol in unique_symbols if symbol not in current_prices]
+        if symbols:
+            current_prices.update(await price_service_instance.get_prices(symbols))
         
         # Format alerts with current prices
         alert_messages = []
-        for alert in alerts:
-            symbol = alert['symbol'].upper()
+        for alert, symbol in zip(alerts, upper_symbols):
             current_price = current_prices.get(symbol, {}).get('price', alert.get('current_price', 0))
             target_price = alert['target_price']
             price_diff = ((current_price - target_price) / target_price * 100) if target_price else 0
@@ -162,106 +188,86 @@ async def list_alerts_command(update: Update, context: ContextTypes.DEFAULT_TYPE
             
             # Create progress bar (20 characters wide)
             progress = min(1.0, max(0.0, current_price / (target_price * 1.5)))
-            progress_bar = "█" * int(progress * 20)
-            progress_bar = progress_bar.ljust(20, "░")
+            filled = int(progress * _BAR_WIDTH)
+            progress_bar = _FULL_BAR[:filled] + _EMPTY_BAR[filled:]
             
-            # Format alert message
-            alert_msg = (
+            # Format alert message with its ID for reference
+            alert_messages.append(
                 f"{status_emoji} *{symbol}*\n"
                 f"`{progress_bar}`\n"
                 f"• Target: ${target_price:,.2f} ({alert['condition']})\n"
-                f"• Current: ${current_price:,.2f} ({price_diff:+.2f}%)"
+                f"• Current: ${current_price:,.2f} ({price_diff:+.2f}%)\n"
+                f"• ID: `{alert['id']}`"
             )
-            
-            # Add alert ID for reference
-            alert_msg += f"\n• ID: `{alert['id']}`"
-            
-            alert_messages.append(alert_msg)
         
         # Create paginated messages (max 5 alerts per message)
         max_alerts_per_message = 5
+        pages = []
         for i in range(0, len(alert_messages), max_alerts_per_message):
             chunk = alert_messages[i:i + max_alerts_per_message]
-            message = "🔔 *Your Alerts* 🔔\n\n"
-            message += "\n\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n".join(chunk)
-            
             # Add footer to the last message
-            if i + max_alerts_per_message >= len(alert_messages):
-                message += "\n\nUse `/delalert <id>` to remove an alert."
-            
+            footer = _ALERTS_FOOTER if i + max_alerts_per_message >= len(alert_messages) else ""
+            pages.append(_ALERTS_HEADER + _ALERTS_SEPARATOR.join(chunk) + footer)
+
+        # Send pages one at a time so they arrive in order, footer last
+        for page in pages:
             await update.message.reply_text(
-                message,
+                page,
                 parse_mode=ParseMode.MARKDOWN,
                 disable_web_page_preview=True
             )
-            
+
     except Exception as e:
-        logger.error(f"Error in alerts command: {e}")
+        if isinstance(e, UPSTREAM_ERRORS):
+            logger.warning("Upstream failure in alerts command: {}", e)
+        else:
+            logger.exception("Error in alerts command: {}", e)
         await update.message.reply_text(
             "❌ Failed to fetch alerts. Please try again later.",
             parse_mode=ParseMode.MARKDOWN
         )
-    finally:
-        await _delete_message_safe(loading_msg)
 
 async def delete_alert_command(update: Update, context: ContextTypes.DEFAULT_TYPE, alert_service_instance):
     """Handle /delalert command with improved feedback and confirmation"""
-    loading_msg = await _send_loading_message(update)
-    
     try:
         # Validate command arguments
         if not context.args:
-            help_text = (
-                "🗑 *Delete Alert* 🗑\n\n"
-                "*Usage:* `/delalert <alert_id>`\n"
-                "*Example:* `/delalert 12345`\n\n"
-                "Use `/alerts` to see your active alerts and their IDs."
-            )
             await update.message.reply_text(
-                help_text,
+                _DELALERT_USAGE,
                 parse_mode=ParseMode.MARKDOWN
             )
-            await _delete_message_safe(loading_msg)
             return
             
         alert_id = context.args[0]
+        show_typing(update, context)
         
-        # First, get the alert details to show what's being deleted
-        alerts = await alert_service_instance.get_user_alerts(update.effective_user.id)
-        alert_to_delete = next((a for a in alerts if str(a['id']) == alert_id), None)
+        # Delete the alert; the service returns the removed alert's details,
+        # so it isn't looked up separately first
+        result = await alert_service_instance.delete_alert(
+            user_id=update.effective_user.id,
+            alert_id=alert_id
+        )
         
-        if not alert_to_delete:
+        if result.get('not_found'):
             await update.message.reply_text(
                 "❌ Alert not found. Please check the alert ID and try again.\n"
                 "Use `/alerts` to see your active alerts.",
                 parse_mode=ParseMode.MARKDOWN
             )
-            await _delete_message_safe(loading_msg)
-            return
-        
-        # Delete the alert
-        result = await alert_service_instance.delete_alert(
-            user_id=update.effective_user.id,
-            alert_id=alert_id
-        )
-        
-        if 'error' in result:
+        elif 'error' in result:
             await update.message.reply_text(
-                f"❌ {result['error']}",
+                f"❌ {result['error'].translate(_MD_ESCAPE)}",
                 parse_mode=ParseMode.MARKDOWN
             )
         else:
             # Format success message with alert details
-            symbol = alert_to_delete['symbol'].upper()
-            target_price = alert_to_delete['target_price']
-            condition = alert_to_delete['condition']
-            
-            success_msg = (
-                f"🗑 *Alert Deleted* ✅\n\n"
-                f"• *Symbol:* {symbol}\n"
-                f"• *Condition:* Price {condition.upper()} ${target_price:,.2f}\n"
-                f"• *Alert ID:* `{alert_id}`"
-            )
+            alert_to_delete = result['alert']
+            success_msg = _ALERT_DELETED_TMPL.format_map({
+                'symbol': alert_to_delete['symbol'].upper(),
+                'condition': alert_to_delete['condition'].upper(),
+                'target_price': alert_to_delete['target_price'],
+                'alert_id': alert_id
+            })
             
             await update.message.reply_text(
                 success_msg,
@@ -269,10 +275,11 @@ async def delete_alert_command(update: Update, context: ContextTypes.DEFAULT_TYP
             )
             
     except Exception as e:
-        logger.error(f"Error in delalert command: {e}")
+        if isinstance(e, UPSTREAM_ERRORS):
+            logger.warning("Upstream failure in delalert command: {}", e)
+        else:
+            logger.exception("Error in delalert command: {}", e)
         await update.message.reply_text(
             "❌ Failed to delete alert. Please try again later.",
             parse_mode=ParseMode.MARKDOWN
-        )
-    finally:
-        await _delete_message_safe(loading_msg)
\ No newline at end of file
+        )
\ No newline at end of file
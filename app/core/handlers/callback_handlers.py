@@ -1,68 +1,99 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from loguru import logger
+from typing import Dict, List, Optional
+import asyncio
 
 # Import the command handlers that can be triggered by callbacks
 from app.core.handlers.price_handlers import price_command, coins_command, price_history_command
 
-async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, price_service_instance, coin_service_instance):
+async def _handle_coins(update: Update, context: ContextTypes.DEFAULT_TYPE, parts: List[str], price_service_instance, coin_service_instance):
+    """Handle coins pagination"""
+    query = update.callback_query
+    try:
+        page = int(parts[1])
+        return await coins_command(update, context, coin_service_instance, is_callback=True, page=page)
+    except (ValueError, IndexError) as e:
+        logger.error("Invalid page number in callback: {}", query.data)
+        return "❌ Invalid page number"
+    except Exception as e:
+        logger.error("Error in coins pagination: {}", e)
+        return "❌ Failed to load page"
+
+async def _handle_history(update: Update, context: ContextTypes.DEFAULT_TYPE, parts: List[str], price_service_instance, coin_service_instance):
+    """Handle history time period selection"""
+    query = update.callback_query
+    try:
+        symbol = parts[1]
+        days = int(parts[2]) if len(parts) > 2 else 7
+        return await price_history_command(update, context, price_service_instance, symbol, days, is_callback=True)
+    except (ValueError, IndexError) as e:
+        logger.error("Invalid history parameters in callback: {}", query.data)
+        return "❌ Invalid parameters"
+    except Exception as e:
+        logger.error("Error in history callback: {}", e)
+        return "❌ Failed to load history"
+
+async def _handle_price(update: Update, context: ContextTypes.DEFAULT_TYPE, parts: List[str], price_service_instance, coin_service_instance):
+    """Handle price refresh from button"""
+    query = update.callback_query
+    try:
+        symbol = parts[1]
+        return await price_command(update, context, price_service_instance, symbol=symbol, is_callback=True)
+    except (ValueError, IndexError) as e:
+        logger.error("Invalid price parameters in callback: {}", query.data)
+        return "❌ Invalid parameters"
+    except Exception as e:
+        logger.error("Error in price callback: {}", e)
+        return "❌ Failed to load price"
+
+async def _handle_close(update: Update, context: ContextTypes.DEFAULT_TYPE, parts: List[str], price_service_instance, coin_service_instance):
+    """Handle close button"""
+    query = update.callback_query
+    try:
+        await query.message.delete()
+    except Exception as e:
+        logger.error("Error deleting message: {}", e)
+        return "❌ Failed to close message"
+
+async def _handle_unknown(update: Update, context: ContextTypes.DEFAULT_TYPE, parts: List[str], price_service_instance, coin_service_instance):
+    """Handle buttons without an action"""
+    return "⚠️ This button doesn't do anything yet!"
+
+# Callback data is "<action>" or "<action>_<args...>"; dispatch on the action.
+# Handlers return the notice to answer the query with, or None
+_CALLBACK_HANDLERS = {
+    'coins': _handle_coins,
+    'history': _handle_history,
+    'price': _handle_price,
+    'close': _handle_close,
+}
+
+async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE, price_service_instance, coin_service_instance, limits: Optional[Dict[str, asyncio.Semaphore]] = None):
     """Handle button callbacks"""
     query = update.callback_query
-    await query.answer()
-    
+    notice = None
     try:
-        if query.data.startswith('coins_'):
-            # Handle coins pagination
-            try:
-                page = int(query.data.split('_')[1])
-                await coins_command(update, context, coin_service_instance, is_callback=True, page=page)
-            except (ValueError, IndexError) as e:
-                logger.error(f"Invalid page number in callback: {query.data}")
-                await query.answer("❌ Invalid page number")
-            except Exception as e:
-                logger.error(f"Error in coins pagination: {e}")
-                await query.answer("❌ Failed to load page")
-        
-        elif query.data.startswith('history_'):
-            # Handle history time period selection
-            try:
-                parts = query.data.split('_')
-                symbol = parts[1]
-                days = int(parts[2]) if len(parts) > 2 else 7
-                await price_history_command(update, context, price_service_instance, symbol, days, is_callback=True)
-            except (ValueError, IndexError) as e:
-                logger.error(f"Invalid history parameters in callback: {query.data}")
-                await query.answer("❌ Invalid parameters")
-            except Exception as e:
-                logger.error(f"Error in history callback: {e}")
-                await query.answer("❌ Failed to load history")
-        
-        elif query.data.startswith('price_'):
-            # Handle price refresh from button
-            try:
-                symbol = query.data.split('_')[1]
-                await price_command(update, context, price_service_instance, symbol=symbol, is_callback=True)
-            except (ValueError, IndexError) as e:
-                logger.error(f"Invalid price parameters in callback: {query.data}")
-                await query.answer("❌ Invalid parameters")
-            except Exception as e:
-                logger.error(f"Error in price callback: {e}")
-                await query.answer("❌ Failed to load price")
-        
-        elif query.data == 'close':
-            # Handle close button
-            try:
-                await query.message.delete()
-            except Exception as e:
-                logger.error(f"Error deleting message: {e}")
-                await query.answer("❌ Failed to close message")
-        
+        parts = query.data.split('_', 2)
+        # "close" takes no arguments; every other action needs at least one
+        if (parts[0] == 'close') != (len(parts) == 1):
+            handler = _handle_unknown
+        else:
+            handler = _CALLBACK_HANDLERS.get(parts[0], _handle_unknown)
+        # Actions are named after their commands and share their concurrency limits
+        semaphore = limits.get(parts[0]) if limits else None
+        if semaphore:
+            async with semaphore:
+                notice = await handler(update, context, parts, price_service_instance, coin_service_instance)
         else:
-            await query.answer("⚠️ This button doesn't do anything yet!")
+            notice = await handler(update, context, parts, price_service_instance, coin_service_instance)
     
     except Exception as e:
-        logger.error(f"Error in button callback: {e}", exc_info=True)
-        try:
-            await query.answer("❌ An error occurred. Please try again.")
-        except:
-            pass
\ No newline at end of file
+        logger.error("Error in button callback: {}", e)
+        notice = "❌ An error occurred. Please try again."
+
+    # A query can only be answered once, so it is answered here and nowhere else
+    try:
+        await query.answer(notice)
+    except Exception as e:
+        logger.warning("Failed to answer button callback: {}", e)
\ No newline at end of file
@@ -2,13 +2,25 @@ from telegram import Update
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 from loguru import logger
+from html import escape
+
+from app.core.messages import split_message
+from app.core.handlers.price_handlers import show_typing, UPSTREAM_ERRORS
+
+# Caption layout for a single /news item
+_CAPTION_TMPL = (
+    "<b>{title}</b>\n\n"
+    "{description}\n\n"
+    "📰 Source: {source}\n"
+    "🔗 <a href='{url}'>Read more</a>"
+)
 
 # Assume news_service is available via context or passed as an argument
 async def news_command(update: Update, context: ContextTypes.DEFAULT_TYPE, news_service_instance):
     """Handle /news command - Show detailed news with images and descriptions"""
     try:
         # Send typing action - This is used instead of a "please wait" message
-        await update.message.chat.send_action(action='typing')
+        show_typing(update, context)
         
         # Get news items
         news_items = await news_service_instance.get_news(limit=3)
@@ -17,50 +29,40 @@ async def news_command(update: Update, context: ContextTypes.DEFAULT_TYPE, news_
             await update.message.reply_text("❌ No news available at the moment. Please try again later.")
             return
 
-        # Send each news item as a separate message with image and description
+        # Build every item into one message instead of one send per item
+        parts = ["<b>📰 Latest Crypto News</b>"]
         for item in news_items:
-            # Escape special characters in title and description
-            title = item.get('title', 'No title').replace('[', '\\[').replace('*', '\\*').replace('_', '\\_').replace('`', '\\`')
-            description = item.get('description', '').replace('[', '\\[').replace('*', '\\*').replace('_', '\\_').replace('`', '\\`')
-            
-            # Create caption with source and description
-            caption = (
-                f"<b>{title}</b>\n\n"
-                f"{description}\n\n"
-                f"📰 Source: {item.get('source', 'Unknown')}\n"
-                f"🔗 <a href='{item.get('url', '')}'>Read more</a>"
-            )
-            
-            # Send photo with caption if image is available, otherwise send text
-            if item.get('image'):
-                try:
-                    await update.message.reply_photo(
-                        photo=item['image'],
-                        caption=caption,
-                        parse_mode='HTML',
-                        link_preview_options={"is_disabled": False}
-                    )
-                    continue
-                except Exception as e:
-                    logger.warning(f"Failed to send photo: {e}")
-                    # Fall back to text if photo fails
-            
-            # If no image or image failed to send, send text only
+            # Messages are sent as HTML, so escape the text for HTML
+            parts.append(_CAPTION_TMPL.format_map({
+                'title': escape(item.get('title', 'No title')),
+                'description': escape(item.get('description', '')),
+                'source': escape(item.get('source', 'Unknown')),
+                'url': escape(item.get('url', ''))
+            }))
+
+        # The link preview shows the first article's image. Usually this is one
+        # message; any overflow messages are sent silently so the user is
+        # notified once per /news
+        for i, message in enumerate(split_message(parts)):
             await update.message.reply_text(
-                caption,
-                parse_mode='HTML',
-                disable_web_page_preview=False
+                message,
+                parse_mode=ParseMode.HTML,
+                disable_web_page_preview=False,
+                disable_notification=i > 0
             )
 
     except Exception as e:
-        logger.error(f"Error in news command: {e}")
+        if isinstance(e, UPSTREAM_ERRORS):
+            logger.warning("Upstream failure in news command: {}", e)
+        else:
+            logger.exception("Error in news command: {}", e)
         await update.message.reply_text("❌ Failed to fetch news. Please try again later.")
         
 async def headlines_command(update: Update, context: ContextTypes.DEFAULT_TYPE, news_service_instance):
     """Handle /headlines command - Show top 5 headlines"""
     try:
         # Send typing action - This is used instead of a "please wait" message
-        await update.message.chat.send_action(action='typing')
+        show_typing(update, context)
         
         # Get headlines
         headlines = await news_service_instance.get_headlines(limit=5)
@@ -70,18 +72,26 @@ async def headlines_command(update: Update, context: ContextTypes.DEFAULT_TYPE,
             return
         
         # Format headlines message
+        normalized = [
+            (escape(item.get('title', 'No title')), escape(item.get('url', '')), escape(item.get('source', 'Unknown')))
+            for item in headlines
+        ]
         message = ["<b>📰 Top Crypto Headlines:</b>\n"]
-        for i, item in enumerate(headlines, 1):
-            title = item.get('title', 'No title').replace('[', '\\[').replace('*', '\\*').replace('_', '\\_').replace('`', '\\`')
-            message.append(f"{i}. <a href='{item.get('url', '')}'>{title}</a> - {item.get('source', 'Unknown')}")
+        message.extend(
+            f"{i}. <a href='{url}'>{title}</a> - {source}"
+            for i, (title, url, source) in enumerate(normalized, 1)
+        )
         
         # Send the message
         await update.message.reply_text(
             '\n\n'.join(message),
-            parse_mode='HTML',
+            parse_mode=ParseMode.HTML,
             disable_web_page_preview=True
         )
         
     except Exception as e:
-        logger.error(f"Error in headlines command: {e}")
+        if isinstance(e, UPSTREAM_ERRORS):
+            logger.warning("Upstream failure in headlines command: {}", e)
+        else:
+            logger.exception("Error in headlines command: {}", e)
         await update.message.reply_text("❌ Failed to fetch headlines. Please try again later.")
@@ -1,31 +1,152 @@
-from telegram import Update, Message, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
-from telegram.constants import ParseMode
+from telegram.constants import ParseMode, ChatAction
+from telegram.error import NetworkError
 from loguru import logger
-from typing import Optional
+from typing import Optional, Set, Dict, Tuple
+import asyncio
 from datetime import datetime
+from functools import lru_cache
+import aiohttp
+
+# All messages in this module are HTML formatted
+_HTML = ParseMode.HTML
+
+# Message layouts, filled with str.format per call
+_PRICE_TMPL = (
+    "📊 <b>{symbol} Price</b>\n"
+    "<code>────────────────────</code>\n"
+    "💰 <b>Price:</b> ${price:,.2f}\n"
+    "{change_emoji} <b>24h Change:</b> {change_emoji} {change_abs:.2f}%\n"
+    "📊 <b>24h Volume:</b> ${volume:,.0f}\n"
+    "💎 <b>Market Cap:</b> ${market_cap:,.0f}\n"
+    "<code>────────────────────</code>\n"
+    "🔍 <b>Quick Actions</b> (click buttons below)"
+)
+
+_COIN_ROW_TMPL = (
+    "<b>{rank}. {name} ({symbol})</b>\n"
+    "   💵 Price: ${price:,.2f}\n"
+    "   {change_emoji} 24h: {change_emoji} {change_abs:.2f}%\n"
+    "   📊 Market Cap: ${market_cap_b:,.2f}B\n"
+    "   ──────────────────────────\n"
+)
+
+def _format_coin_row(rank: int, coin: dict) -> str:
+    """Format one /coins list entry"""
+    change_24h = coin.get('price_change_percentage_24h', 0)
+    return _COIN_ROW_TMPL.format(
+        rank=rank,
+        name=coin['name'],
+        symbol=coin['symbol'].upper(),
+        price=coin['current_price'],
+        change_emoji='🟢' if change_24h >= 0 else '🔴',
+        change_abs=abs(change_24h),
+        market_cap_b=coin['market_cap']/1_000_000_000
+    )
+
+# Rendered /coins pages: page -> (coins, text, has_more). A render is reused
+# only while the coin service returns the same cached list it was built from,
+# so it expires together with that data. Oldest pages are evicted first
+_COINS_PAGE_CACHE_SIZE = 32
+_coins_pages: Dict[int, Tuple[list, str, bool]] = {}
+
+@lru_cache(maxsize=1024)
+def _fmt_ts(timestamp_ms: int) -> str:
+    """Format a millisecond history timestamp; points repeat across cached history calls"""
+    return datetime.fromtimestamp(timestamp_ms / 1000).strftime('%b %d, %H:%M')
+
+# Expected upstream failures; logged as warnings without a traceback
+UPSTREAM_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, NetworkError)
+
+# Keyboards are immutable, so static ones are built once and symbol-specific
+# ones are cached per symbol instead of being rebuilt on every call
+_CLOSE_BUTTON = InlineKeyboardButton("❌ Close", callback_data="close")
+
+@lru_cache(maxsize=256)
+def _price_keyboard(symbol: str) -> InlineKeyboardMarkup:
+    """Actions shown under a price card"""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("📈 View History", callback_data=f"history_{symbol}_7")],
+        [_CLOSE_BUTTON]
+    ])
+
+@lru_cache(maxsize=256)
+def _price_retry_keyboard(symbol: str) -> InlineKeyboardMarkup:
+    """Retry/close actions for a failed price lookup"""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("🔄 Try Again", callback_data=f"price_{symbol}")],
+        [_CLOSE_BUTTON]
+    ])
+
+@lru_cache(maxsize=256)
+def _history_keyboard(symbol: str) -> InlineKeyboardMarkup:
+    """Period switcher and navigation shown under a price history card"""
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton("24h", callback_data=f"history_{symbol}_1"),
+            InlineKeyboardButton("7d", callback_data=f"history_{symbol}_7"),
+            InlineKeyboardButton("30d", callback_data=f"history_{symbol}_30")
+        ],
+        [
+            InlineKeyboardButton("🔙 Back to Price", callback_data=f"price_{symbol}"),
+            _CLOSE_BUTTON
+        ]
+    ])
+
+@lru_cache(maxsize=256)
+def _history_unavailable_keyboard(symbol: str, days: int) -> InlineKeyboardMarkup:
+    """Retry/back actions when the history service returned an error"""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("🔄 Try Again", callback_data=f"history_{symbol}_{days}")],
+        [InlineKeyboardButton("🔙 Back", callback_data=f"price_{symbol}")]
+    ])
+
+@lru_cache(maxsize=256)
+def _history_retry_keyboard(symbol: str, days: int) -> InlineKeyboardMarkup:
+    """Retry/close actions after an unexpected history failure"""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("🔄 Try Again", callback_data=f"history_{symbol}_{days}")],
+        [_CLOSE_BUTTON]
+    ])
+
+@lru_cache(maxsize=64)
+def _coins_keyboard(page: int, has_more: bool) -> InlineKeyboardMarkup:
+    """Refresh and pagination buttons for a /coins page"""
+    row = [InlineKeyboardButton("🔄 Refresh", callback_data=f"coins_{page}")]
+    if has_more:
+        row.append(InlineKeyboardButton("Show More ➡️", callback_data=f"coins_{page+1}"))
+    return InlineKeyboardMarkup([row])
+
+@lru_cache(maxsize=256)
+def _back_to_price_keyboard(symbol: str) -> InlineKeyboardMarkup:
+    """Single back button to the price card"""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("🔙 Back", callback_data=f"price_{symbol}")]
+    ])
 
 # Assume price_service is available via context or passed as an argument
 # For this example, we'll pass the necessary functions from TelegramBot class
-async def _send_loading_message(update: Update) -> Optional[Message]:
-    """Send a loading message and return it for later deletion"""
-    try:
-        return await update.message.reply_text("⏳ Processing your request...")
-    except Exception as e:
-        logger.error(f"Error sending loading message: {e}")
-        return None
+# Keep references to fire-and-forget tasks so they are not garbage collected mid-flight
+_background_tasks: Set[asyncio.Task] = set()
 
-async def _delete_message_safe(message: Optional[Message]):
-    """Safely delete a message"""
-    if message:
+def show_typing(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show the native "typing..." indicator without waiting for the API call"""
+    async def _send():
         try:
-            await message.delete()
+            await context.bot.send_chat_action(chat_id=update.effective_chat.id, action=ChatAction.TYPING)
         except Exception as e:
-            logger.error(f"Error deleting message: {e}")
+            logger.error("Error sending typing action: {}", e)
+
+    task = asyncio.create_task(_send())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+# When run from a button (is_callback), the commands edit the button's message
+# and return the notice for button_callback to answer the query with, if any
 
 async def price_command(update: Update, context: ContextTypes.DEFAULT_TYPE, price_service_instance, symbol: str = None, is_callback: bool = False):
     """Handle /price command with improved formatting"""
-    loading_msg = None
     try:
         # Get symbol from callback or command args
         if not symbol:
@@ -36,20 +157,17 @@ async def price_command(update: Update, context: ContextTypes.DEFAULT_TYPE, pric
                     "Please provide a cryptocurrency symbol.\n"
                     "Example: <code>/price btc</code>\n"
                     "Use /coins to see supported cryptocurrencies",
-                    parse_mode='HTML'
+                    parse_mode=_HTML
                 )
-                if is_callback:
-                    await update.callback_query.answer()
                 return
             symbol = context.args[0].lower()
 
-        # Show loading message
+        # Show typing indicator
         if not is_callback:
-            loading_msg = await _send_loading_message(update)
+            show_typing(update, context)
 
         # Get price data
         price_data = await price_service_instance.get_price(symbol)
-        await _delete_message_safe(loading_msg)
 
         if not price_data or 'error' in price_data:
             error_msg = (
@@ -59,21 +177,17 @@ async def price_command(update: Update, context: ContextTypes.DEFAULT_TYPE, pric
                 "Please check the symbol and try again.\n"
                 "Use /coins to see supported cryptocurrencies"
             )
-            reply_markup = InlineKeyboardMarkup([
-                [InlineKeyboardButton("🔄 Try Again", callback_data=f"price_{symbol}")],
-                [InlineKeyboardButton("❌ Close", callback_data="close")]
-            ])
+            reply_markup = _price_retry_keyboard(symbol)
             if is_callback:
                 await update.callback_query.edit_message_text(
                     text=error_msg,
-                    parse_mode='HTML',
+                    parse_mode=_HTML,
                     reply_markup=reply_markup
                 )
-                await update.callback_query.answer()
             else:
                 await update.message.reply_text(
                     error_msg,
-                    parse_mode='HTML',
+                    parse_mode=_HTML,
                     reply_markup=reply_markup
                 )
             return
@@ -82,47 +196,38 @@ async def price_command(update: Update, context: ContextTypes.DEFAULT_TYPE, pric
         change_24h = price_data.get('change_24h', 0)
         change_emoji = '🟢' if change_24h >= 0 else '🔴'
         
-        message_text = (
-            f"📊 <b>{(symbol or '').upper()} Price</b>\n"
-            f"<code>────────────────────</code>\n"
-            f"💰 <b>Price:</b> ${price_data.get('price_usd', 0):,.2f}\n"
-            f"{change_emoji} <b>24h Change:</b> {change_emoji} {abs(change_24h):.2f}%\n"
-            f"📊 <b>24h Volume:</b> ${price_data.get('volume_24h', 0):,.0f}\n"
-            f"💎 <b>Market Cap:</b> ${price_data.get('market_cap', 0):,.0f}\n"
-            f"<code>────────────────────</code>\n"
-            f"🔍 <b>Quick Actions</b> (click buttons below)"
+        message_text = _PRICE_TMPL.format(
+            symbol=(symbol or '').upper(),
+            price=price_data.get('price_usd', 0),
+            change_emoji=change_emoji,
+            change_abs=abs(change_24h),
+            volume=price_data.get('volume_24h', 0),
+            market_cap=price_data.get('market_cap', 0)
         )
 
         # Create inline keyboard with actions
-        keyboard = [
-            [
-                InlineKeyboardButton("📈 View History", callback_data=f"history_{symbol}_7"),
-            ],
-            [
-                InlineKeyboardButton("❌ Close", callback_data="close")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = _price_keyboard(symbol)
 
         if is_callback:
             await update.callback_query.edit_message_text(
                 text=message_text,
-                parse_mode='HTML',
+                parse_mode=_HTML,
                 reply_markup=reply_markup,
                 disable_web_page_preview=True
             )
-            await update.callback_query.answer()
         else:
             await update.message.reply_text(
                 message_text,
-                parse_mode='HTML',
+                parse_mode=_HTML,
                 reply_markup=reply_markup,
                 disable_web_page_preview=True
             )
 
     except Exception as e:
-        logger.error(f"Error in price command: {e}", exc_info=True)
-        await _delete_message_safe(loading_msg)
+        if isinstance(e, UPSTREAM_ERRORS):
+            logger.warning("Upstream failure in price command: {}", e)
+        else:
+            logger.exception("Error in price command")
         
         error_msg = (
             "❌ <b>Error fetching price data</b>\n\n"
@@ -130,41 +235,34 @@ async def price_command(update: Update, context: ContextTypes.DEFAULT_TYPE, pric
             "Please try again in a moment."
         )
         
-        reply_markup = InlineKeyboardMarkup([
-            [InlineKeyboardButton("🔄 Try Again", callback_data=f"price_{symbol}")],
-            [InlineKeyboardButton("❌ Close", callback_data="close")]
-        ])
+        reply_markup = _price_retry_keyboard(symbol)
         
         if is_callback:
             try:
                 await update.callback_query.edit_message_text(
                     text=error_msg,
-                    parse_mode='HTML',
+                    parse_mode=_HTML,
                     reply_markup=reply_markup
                 )
             except Exception as edit_error:
-                logger.error(f"Error editing message: {edit_error}")
-                try:
-                    await update.callback_query.answer("❌ Error: Could not update message")
-                except:
-                    pass
+                logger.error("Error editing message: {}", edit_error)
+                return "❌ Error: Could not update message"
         else:
             try:
                 await update.message.reply_text(
                     error_msg,
-                    parse_mode='HTML',
+                    parse_mode=_HTML,
                     reply_markup=reply_markup
                 )
             except Exception as send_error:
-                logger.error(f"Error sending error message: {send_error}")
+                logger.error("Error sending error message: {}", send_error)
 
 async def coins_command(update: Update, context: ContextTypes.DEFAULT_TYPE, coin_service_instance, is_callback: bool = False, page: int = 1):
     """Handle /coins command with improved pagination"""
-    loading_msg = None
+    # Resolved before the try so the error handlers can always reply through it
+    message = update.callback_query.message if is_callback else update.message
+
     try:
-        # Get the message object based on whether this is a callback or command
-        message = update.callback_query.message if is_callback else update.message
-        
         # Get page number from command args if not provided
         if not is_callback and context.args:
             try:
@@ -174,101 +272,80 @@ async def coins_command(update: Update, context: ContextTypes.DEFAULT_TYPE, coin
         
         per_page = 10  # Reduced number of coins per page for better readability
         
-        # Show loading message
-        if not is_callback:  # Only show loading for initial command, not for callbacks
-            loading_msg = await _send_loading_message(update)
+        # Show typing indicator
+        if not is_callback:  # Only for the initial command, not for callbacks
+            show_typing(update, context)
         
-        # Get coins from service
+        # Get coins from service; a cache hit returns the same list object
         coins = await coin_service_instance.get_coins(page=page, per_page=per_page)
         
-        # Delete loading message if it exists
-        await _delete_message_safe(loading_msg)
-        
         if not coins:
             if is_callback:
-                await update.callback_query.answer("No more coins to show!")
-                return
+                return "No more coins to show!"
             await update.message.reply_text("❌ No coins found. Please try again later.")
             return
         
-        # Format message with better spacing and emojis
-        message_text = [
-            "<b>💰 Top Cryptocurrencies</b>\n",
-            f"<i>Showing {len(coins)} coins • Page {page}</i>\n\n"
-        ]
-        
-        for i, coin in enumerate(coins, 1):
-            change_24h = coin.get('price_change_percentage_24h', 0)
-            change_emoji = '🟢' if change_24h >= 0 else '🔴'
-            
-            message_text.append(
-                f"<b>{i + (page-1)*per_page}. {coin['name']} ({coin['symbol'].upper()})</b>\n"
-                f"   💵 Price: ${coin['current_price']:,.2f}\n"
-                f"   {change_emoji} 24h: {change_emoji} {abs(change_24h):.2f}%\n"
-                f"   📊 Market Cap: ${coin['market_cap']/1_000_000_000:,.2f}B\n"
-                f"   ──────────────────────────\n"
-            )
-        
-        # Create inline keyboard with a single "Show More" button
-        keyboard = []
-        
-        # Add Show More button if there are more coins to show
-        if len(coins) == per_page:  # Only show if there might be more
-            keyboard.append([
-                InlineKeyboardButton("🔄 Refresh", callback_data=f"coins_{page}"),
-                InlineKeyboardButton("Show More ➡️", callback_data=f"coins_{page+1}")
-            ])
+        # Reuse the rendered page while it was built from this exact data
+        cached = _coins_pages.get(page)
+        if cached and cached[0] is coins:
+            _, message_text, has_more = cached
         else:
-            keyboard.append([
-                InlineKeyboardButton("🔄 Refresh", callback_data=f"coins_{page}")
-            ])
-        
-        reply_markup = InlineKeyboardMarkup(keyboard) if keyboard else None
+            # Format message; each row already ends with its own newline
+            header = (
+                "<b>💰 Top Cryptocurrencies</b>\n"
+                f"<i>Showing {len(coins)} coins • Page {page}</i>\n\n"
+            )
+            offset = (page - 1) * per_page
+            message_text = header + "".join(
+                _format_coin_row(i + offset, coin) for i, coin in enumerate(coins, 1)
+            )
+            # "Show More" only if there might be more coins
+            has_more = len(coins) == per_page
+            if page not in _coins_pages and len(_coins_pages) >= _COINS_PAGE_CACHE_SIZE:
+                del _coins_pages[next(iter(_coins_pages))]
+            _coins_pages[page] = (coins, message_text, has_more)
         
-        # Join message parts
-        message_text = "\n".join(message_text)
+        # Create inline keyboard
+        reply_markup = _coins_keyboard(page, has_more)
         
         # If it's a callback (pagination), edit the existing message
         if is_callback:
             try:
                 await update.callback_query.edit_message_text(
                     text=message_text,
-                    parse_mode='HTML',
+                    parse_mode=_HTML,
                     reply_markup=reply_markup
                 )
-                await update.callback_query.answer()
             except Exception as e:
-                logger.error(f"Error updating coins message: {e}")
-                await update.callback_query.answer("Failed to update. Please try again.")
+                logger.error("Error updating coins message: {}", e)
+                return "Failed to update. Please try again."
         else:
             # Send new message for initial command
             await update.message.reply_text(
                 message_text,
-                parse_mode='HTML',
+                parse_mode=_HTML,
                 reply_markup=reply_markup,
                 disable_web_page_preview=True
             )
 
     except Exception as e:
-        logger.error(f"Error in coins command: {e}")
-        await _delete_message_safe(loading_msg)
+        if isinstance(e, UPSTREAM_ERRORS):
+            logger.warning("Upstream failure in coins command: {}", e)
+        else:
+            logger.exception("Error in coins command")
         
         error_msg = "❌ Failed to fetch coins. Please try again later."
         if is_callback:
-            try:
-                await update.callback_query.answer(error_msg)
-            except:
-                pass
+            return error_msg
         else:
             await update.message.reply_text(error_msg)
 
 async def price_history_command(update: Update, context: ContextTypes.DEFAULT_TYPE, price_service_instance, symbol: str = None, days: int = 7, is_callback: bool = False):
     """Handle /history command with improved formatting and navigation"""
-    loading_msg = None
+    # Resolved before the try so the error handlers can always reply through it
+    message = update.callback_query.message if is_callback else update.message
+
     try:
-        # Get message object based on whether this is a callback or command
-        message = update.callback_query.message if is_callback else update.message
-        
         # Get symbol and days from command args if not provided
         if not symbol or not is_callback:
             if not context.args:
@@ -277,32 +354,30 @@ async def price_history_command(update: Update, context: ContextTypes.DEFAULT_TY
                     "Please provide a cryptocurrency symbol.\n"
                     "Example: <code>/history btc 7</code>\n"
                     "(7 days is default if no number is provided)",
-                    parse_mode='HTML'
+                    parse_mode=_HTML
                 )
                 return
             
             symbol = context.args[0].lower()
             if len(context.args) > 1:
-                try:
-                    days = int(context.args[1])
-                    if not 1 <= days <= 30:
-                        raise ValueError("Days must be between 1 and 30")
-                except ValueError:
+                # Validate with a branch instead of raising and catching ValueError
+                days_arg = context.args[1]
+                days = int(days_arg) if days_arg.isdecimal() else 0
+                if not 1 <= days <= 30:
                     await message.reply_text(
                         "❌ <b>Invalid number of days</b>\n\n"
                         "Please provide a number between 1 and 30.\n"
                         "Example: <code>/history btc 7</code>",
-                        parse_mode='HTML'
+                        parse_mode=_HTML
                     )
                     return
 
-        # Show loading message
+        # Show typing indicator
         if not is_callback:
-            loading_msg = await _send_loading_message(update)
+            show_typing(update, context)
 
         # Get historical data
         history_data = await price_service_instance.get_price_history(symbol, days)
-        await _delete_message_safe(loading_msg)
 
         if not history_data or 'error' in history_data:
             error_msg = (
@@ -311,21 +386,18 @@ async def price_history_command(update: Update, context: ContextTypes.DEFAULT_TY
                 f"Error: {history_data.get('error', 'Unknown error') if history_data else 'No data'}"
             )
             
-            reply_markup = InlineKeyboardMarkup([
-                [InlineKeyboardButton("🔄 Try Again", callback_data=f"history_{symbol}_{days}")],
-                [InlineKeyboardButton("🔙 Back", callback_data=f"price_{symbol}")]
-            ])
+            reply_markup = _history_unavailable_keyboard(symbol, days)
 
             if is_callback:
                 await update.callback_query.edit_message_text(
                     text=error_msg,
-                    parse_mode='HTML',
+                    parse_mode=_HTML,
                     reply_markup=reply_markup
                 )
             else:
                 await message.reply_text(
                     error_msg,
-                    parse_mode='HTML',
+                    parse_mode=_HTML,
                     reply_markup=reply_markup
                 )
             return
@@ -336,9 +408,7 @@ async def price_history_command(update: Update, context: ContextTypes.DEFAULT_TY
 
         if not history:
             no_data_msg = f"❌ No historical data available for {symbol}"
-            reply_markup = InlineKeyboardMarkup([
-                [InlineKeyboardButton("🔙 Back", callback_data=f"price_{symbol}")]
-            ])
+            reply_markup = _back_to_price_keyboard(symbol)
             if is_callback:
                 await update.callback_query.edit_message_text(
                     text=no_data_msg,
@@ -355,7 +425,7 @@ async def price_history_command(update: Update, context: ContextTypes.DEFAULT_TY
         change_emoji = '🟢' if price_change >= 0 else '🔴'
 
         # Format the message
-        message_text = (
+        header = (
             f"📈 <b>{symbol} Price History</b>\n"
             f"<code>────────────────────</code>\n"
             f"📅 <b>Period:</b> {days} day{'s' if days > 1 else ''}\n"
@@ -367,37 +437,24 @@ async def price_history_command(update: Update, context: ContextTypes.DEFAULT_TY
         )
 
         # Add last 5 data points (or all if less than 5)
-        for i, point in enumerate(history[-5:], 1):
-            timestamp = point.get('timestamp', 0) / 1000  # Convert from ms to seconds if needed
-            date = datetime.fromtimestamp(timestamp).strftime('%b %d, %H:%M')
-            price = point.get('price', 0)
-            message_text += f"• {date}: <b>${price:,.2f}</b>\n"
+        message_text = header + "".join(
+            f"• {_fmt_ts(point.get('timestamp', 0))}: <b>${point.get('price', 0):,.2f}</b>\n"
+            for point in history[-5:]
+        )
 
         # Create inline keyboard with time period options
-        keyboard = [
-            [
-                InlineKeyboardButton("24h", callback_data=f"history_{symbol}_1"),
-                InlineKeyboardButton("7d", callback_data=f"history_{symbol}_7"),
-                InlineKeyboardButton("30d", callback_data=f"history_{symbol}_30")
-            ],
-            [
-                InlineKeyboardButton("🔙 Back to Price", callback_data=f"price_{symbol}"),
-                InlineKeyboardButton("❌ Close", callback_data="close")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = _history_keyboard(symbol)
 
         if is_callback:
             await update.callback_query.edit_message_text(
                 text=message_text,
-                parse_mode='HTML',
+                parse_mode=_HTML,
                 reply_markup=reply_markup
             )
-            await update.callback_query.answer()
         else:
             await message.reply_text(
                 message_text,
-                parse_mode='HTML',
+                parse_mode=_HTML,
                 reply_markup=reply_markup,
                 disable_web_page_preview=True
             )
@@ -409,21 +466,19 @@ async def price_history_command(update: Update, context: ContextTypes.DEFAULT_TY
             "Please provide a valid number between 1 and 30 for days.\n"
             "Example: <code>/history btc 7</code>"
         )
-        await _delete_message_safe(loading_msg)
         if is_callback:
-            await update.callback_query.answer(str(ve))
+            return str(ve)
         else:
-            await message.reply_text(error_msg, parse_mode='HTML')
+            await message.reply_text(error_msg, parse_mode=_HTML)
             
     except Exception as e:
-        logger.error(f"Error in history command: {e}", exc_info=True)
-        await _delete_message_safe(loading_msg)
+        if isinstance(e, UPSTREAM_ERRORS):
+            logger.warning("Upstream failure in history command: {}", e)
+        else:
+            logger.exception("Error in history command")
         error_msg = "❌ Failed to fetch price history. Please try again later."
         
-        reply_markup = InlineKeyboardMarkup([
-            [InlineKeyboardButton("🔄 Try Again", callback_data=f"history_{symbol}_{days}")],
-            [InlineKeyboardButton("❌ Close", callback_data="close")]
-        ])
+        reply_markup = _history_retry_keyboard(symbol, days)
 
         if is_callback:
             try:
@@ -432,7 +487,7 @@ async def price_history_command(update: Update, context: ContextTypes.DEFAULT_TY
                     reply_markup=reply_markup
                 )
             except Exception as edit_error:
-                logger.error(f"Error editing message: {edit_error}")
-                await update.callback_query.answer("❌ Error: Could not update message")
+                logger.error("Error editing message: {}", edit_error)
+                return "❌ Error: Could not update message"
         else:
             await message.reply_text(error_msg)
\ No newline at end of file
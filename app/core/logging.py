@@ -3,16 +3,19 @@ from loguru import logger
 from env import env
 
 def setup_logging():
+    # Sinks use enqueue=True so writes happen on a background thread, not the event loop
     # Remove default handler
     logger.remove()
 
-    # Add console handler with custom format
+    # Add console handler with custom format; extended tracebacks and variable
+    # values are kept for the error file only
     logger.add(
         sys.stderr,
         format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
         level=env.LOG_LEVEL,
-        backtrace=True,
-        diagnose=True,
+        backtrace=False,
+        diagnose=False,
+        enqueue=True,
     )
 
     # Add file handler for errors
@@ -24,6 +27,7 @@ def setup_logging():
         retention="7 days",
         backtrace=True,
         diagnose=True,
+        enqueue=True,
     )
 
     # Add file handler for all logs
@@ -33,6 +37,7 @@ def setup_logging():
         level=env.LOG_LEVEL,
         rotation="1 day",
         retention="7 days",
+        enqueue=True,
     )
 
     logger.info(f"Logging setup complete. Level: {env.LOG_LEVEL}") 
\ No newline at end of file
@@ -0,0 +1,45 @@
+from typing import List
+import re
+
+# Telegram rejects text messages longer than this
+_MAX_MESSAGE_LENGTH = 4096
+
+# Opening or closing HTML tag; group 1 is "/" for a closing tag
+_TAG_RE = re.compile(r"<(/?)[a-zA-Z][^>]*>")
+
+def _split_oversized(part: str) -> List[str]:
+    """Cut a part longer than a message into pieces at line breaks outside HTML tags"""
+    # Cuts never land inside a tag, an entity or an element spanning lines;
+    # a run of lines with no such break stays whole even if it is too long
+    pieces = []
+    start = 0  # Where the current piece begins
+    cut = None  # Last safe line break in the current piece
+    depth = 0  # HTML elements still open at the end of the current line
+    end = -1
+    for line in part.split("\n"):
+        end += len(line) + 1  # The line's trailing "\n", or one past the end
+        for closing in _TAG_RE.findall(line):
+            depth += -1 if closing else 1
+        if min(end, len(part)) - start > _MAX_MESSAGE_LENGTH and cut is not None:
+            pieces.append(part[start:cut])
+            start, cut = cut + 1, None
+        if depth <= 0 and end < len(part):
+            cut = end
+    pieces.append(part[start:])
+    return [piece for piece in pieces if piece.strip()]
+
+def split_message(parts: List[str], separator: str = "\n\n") -> List[str]:
+    """Join parts into as few messages as possible, splitting only parts too long to send"""
+    messages = []
+    current = ""
+    for part in parts:
+        for piece in (_split_oversized(part) if len(part) > _MAX_MESSAGE_LENGTH else (part,)):
+            candidate = f"{current}{separator}{piece}" if current else piece
+            if current and len(candidate) > _MAX_MESSAGE_LENGTH:
+                messages.append(current)
+                current = piece
+            else:
+                current = candidate
+    if current:
+        messages.append(current)
+    return messages
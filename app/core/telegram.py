@@ -1,18 +1,26 @@
-from telegram import Bot, Update, Message
-from telegram.ext import Application, CommandHandler, CallbackQueryHandler
+from telegram import Bot, Update
+from telegram.ext import AIORateLimiter, Application, CommandHandler, CallbackQueryHandler
 from telegram.constants import ParseMode
+from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
 from loguru import logger
-from typing import Optional
+from typing import Awaitable, Dict, List, Optional
 import asyncio
+import time
+from collections import defaultdict
+import aiohttp
+import orjson
+from functools import lru_cache, partial
 
 from env import env
+from app.core.messages import split_message
 from app.services.cache_service import CacheService
 from app.services.price_service import price_service
 from app.services.news_service import news_service
 from app.services.alert_service import alert_service
 from app.services.notification_service import notification_service
-from app.core.db import db
 from app.services.coin_service import coin_service
+from app.services.coingecko_service import coingecko_service
 
 # Import handlers
 from app.core.handlers.start_handlers import start_command, help_command
@@ -21,55 +29,216 @@ from app.core.handlers.news_handlers import news_command, headlines_command
 from app.core.handlers.alert_handlers import set_alert_command, list_alerts_command, delete_alert_command
 from app.core.handlers.callback_handlers import button_callback
 
-class TelegramBot:
-    _instance: Optional['TelegramBot'] = None
-    _initialized: bool = False
+# Long polling: up to 100 updates per getUpdates call, held open for 50s
+POLL_BATCH_SIZE = 100
+POLL_TIMEOUT = 50
+POLL_RETRY_DELAY = 5
+# How long shutdown waits for an in-flight getUpdates before cancelling it
+POLL_SHUTDOWN_GRACE = 5
+# How long shutdown waits for queued updates to be handled before dropping them
+UPDATE_DRAIN_TIMEOUT = 10
+# Per-chat workers exit after this many idle seconds
+CHAT_WORKER_IDLE_TIMEOUT = 300
+# Pending alert notifications are buffered up to this many, then the alert
+# checker waits; a fixed pool of workers sends them
+NOTIFICATION_QUEUE_SIZE = 256
+NOTIFICATION_WORKERS = 8
+NOTIFICATION_SEND_TIMEOUT = 30
+# Alerts are checked at least this often; the trigger estimate (a linear
+# extrapolation of the 24h change) can only bring a check forward
+ALERT_CHECK_INTERVAL = 60
+ALERT_CHECK_MIN_DELAY = 5
+ALERT_WAKEUP_DEBOUNCE = 1  # Let a burst of price updates settle before checking
+# Most concurrent runs per command for commands that call the price API, so a
+# burst of users can't exhaust the shared connection pool or trip rate limits
+COMMAND_CONCURRENCY = {"price": 8, "history": 4, "coins": 4, "alerts": 8, "setalert": 8}
+
+# Alert notifications are sent as Markdown
+_PARSE_MD = ParseMode.MARKDOWN
+_UP = '📈'
+_DOWN = '📉'
+
+# Alert notification layout (Markdown), filled with str.format_map per alert
+_ALERT_HEADER_TMPL = (
+    "{emoji} *PRICE ALERT* {emoji}\n\n"
+    "• *{symbol}* is now *{condition_upper}* your target price!\n\n"
+    "🎯 *Target:* ${target_price:,.2f} ({condition})\n"
+)
+_ALERT_CURRENT_TMPL = "💰 *Current:* ${current_price:,.2f} ({price_diff:+.2f}%)"
+_ALERT_STATS_TMPL = (
+    "\n\n📊 *24h Stats:*\n"
+    "• High: ${high_24h:,.2f}\n"
+    "• Low: ${low_24h:,.2f}\n"
+    "• Change: {change_24h:+.2f}%"
+)
+_ALERT_FOOTER = "\n\n🔔 Use /alerts to manage your alerts"
+_ALERT_SEPARATOR = "\n\n━━━━━━━━━━\n\n"
+
+@lru_cache(maxsize=1024)
+def _alert_header(symbol: str, condition: str, target_price: float) -> str:
+    """Static part of an alert notification; identical alerts share one string"""
+    return _ALERT_HEADER_TMPL.format(
+        emoji=_UP if condition == 'above' else _DOWN,
+        symbol=symbol.upper(),
+        condition=condition,
+        condition_upper=condition.upper(),
+        target_price=target_price
+    )
+
+def _format_alert(alert: dict) -> str:
+    """Build the notification text for a triggered alert"""
+    target_price = alert['target_price']
+    current_price = alert['current_price']
+    price_data = alert.get('price_data') or {}
+    ctx = {
+        'current_price': current_price,
+        'price_diff': (current_price - target_price) / target_price * 100,
+        'high_24h': price_data.get('high_24h', 0),
+        'low_24h': price_data.get('low_24h', 0),
+        'change_24h': price_data.get('change_24h', 0),
+    }
+    # 24h stats are only shown when the price data carried them
+    stats = _ALERT_STATS_TMPL.format_map(ctx) if ctx['high_24h'] or ctx['low_24h'] else ""
+    return (
+        _alert_header(alert['symbol'], alert['condition'], target_price)
+        + _ALERT_CURRENT_TMPL.format_map(ctx) + stats + _ALERT_FOOTER
+    )
+
+class OrjsonRequest(HTTPXRequest):
+    """HTTPXRequest that decodes Bot API responses with orjson"""
+
+    @staticmethod
+    def parse_json_payload(payload: bytes) -> dict:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            # orjson rejects invalid UTF-8; fall back to a lenient decode like PTB does
+            try:
+                return orjson.loads(payload.decode("utf-8", "replace"))
+            except orjson.JSONDecodeError as exc:
+                raise TelegramError("Invalid server response") from exc
+
+# Bot commands as (command, description, handler); services are bound once at import
+_COMMANDS = (
+    ("start", "Start the bot", start_command),
+    ("help", "Show available commands", help_command),
+    ("price", "Get current price for a coin", partial(price_command, price_service_instance=price_service)),
+    ("coins", "List supported coins", partial(coins_command, coin_service_instance=coin_service)),
+    ("history", "View price history", partial(price_history_command, price_service_instance=price_service)),
+    ("headlines", "Get top 5 crypto headlines", partial(headlines_command, news_service_instance=news_service)),
+    ("news", "Get latest crypto news with images and descriptions", partial(news_command, news_service_instance=news_service)),
+    ("setalert", "Set price alert", partial(set_alert_command, alert_service_instance=alert_service)),
+    ("alerts", "View your active alerts", partial(list_alerts_command, alert_service_instance=alert_service, price_service_instance=price_service)),
+    ("delalert", "Delete an alert", partial(delete_alert_command, alert_service_instance=alert_service)),
+)
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(TelegramBot, cls).__new__(cls)
-        return cls._instance
+_BOT_COMMANDS = tuple((command, description) for command, description, _ in _COMMANDS)
 
+def _limit_concurrency(handler, semaphore: asyncio.Semaphore):
+    """Wrap a handler so at most the semaphore's count run at once"""
+    async def limited(update: Update, context):
+        async with semaphore:
+            return await handler(update, context)
+    return limited
+
+class TelegramBot:
     def __init__(self):
-        if not self._initialized:
-            self.token = env.TELEGRAM_BOT_TOKEN
-            self.application: Optional[Application] = None
-            self.bot: Optional[Bot] = None
-            self.cache = CacheService()
-            self._initialized = True
-            self._polling_task: Optional[asyncio.Task] = None
-            self._alert_task: Optional[asyncio.Task] = None
-
-    async def initialize(self):
+        self.token = env.TELEGRAM_BOT_TOKEN
+        self.application: Optional[Application] = None
+        self.bot: Optional[Bot] = None
+        self.cache = CacheService()
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._polling_task: Optional[asyncio.Task] = None
+        self._next_offset: Optional[int] = None
+        self._poll_request: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._chat_queues: Dict[Optional[int], asyncio.Queue] = {}
+        self._chat_workers: Dict[Optional[int], asyncio.Task] = {}
+        self._alert_task: Optional[asyncio.Task] = None
+        self._alert_wakeup: Optional[asyncio.Event] = None
+        self._commands_task: Optional[asyncio.Task] = None
+        self._notification_queue: Optional[asyncio.Queue] = None
+        self._notification_workers: List[asyncio.Task] = []
+
+    async def initialize(self, ready: Optional[Awaitable] = None):
         """Initialize the bot and prepare for polling"""
         try:
-            # Initialize services
-            await price_service.initialize()
-            await news_service.initialize()
-            await db.connect()  # Initialize database connection
-            
-            # Initialize bot and application
-            self.bot = Bot(token=self.token)
+            # One connection pool for all outbound API calls, so price, news and coin
+            # requests reuse keep-alive connections and cached DNS lookups
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=30,
+                    ttl_dns_cache=300,
+                    # Price lookups are bursty; keep idle connections open
+                    # between bursts instead of reconnecting after 15s
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True
+                )
+            )
+
+            # Initialize bot and application; the rate limiter queues outgoing calls
+            # under Telegram's flood limits and retries after 429 responses.
+            # Outgoing calls and getUpdates use separate connection pools so the
+            # long poll never occupies a connection a handler is waiting for
             self.application = (
                 Application.builder()
-                .bot(self.bot)
+                .token(self.token)
+                .request(OrjsonRequest(connection_pool_size=32, pool_timeout=20))
+                .get_updates_request(OrjsonRequest(connection_pool_size=4, pool_timeout=60))
+                .rate_limiter(AIORateLimiter(overall_max_rate=28, max_retries=3))
                 .build()
             )
+            self.bot = self.application.bot
 
-            # Set bot in notification service
+            # Notifications go through the application's bot, so they share its
+            # keep-alive connection pool and rate limiter instead of a separate Bot
             notification_service.set_bot(self.bot)
 
             # Register handlers
-            await self._register_handlers()
+            self._register_handlers()
+
+            # Initialize the services and the application concurrently; they are
+            # independent and each waits on its own network round-trips
+            startup = [
+                price_service.initialize(session=self._http),
+                news_service.initialize(session=self._http),
+                coin_service.initialize(session=self._http),
+                self.application.initialize()
+            ]
+            # Anything the handlers depend on (the database) must be ready
+            # before updates are handled, so it joins the warm-up
+            if ready is not None:
+                startup.append(ready)
+            try:
+                await asyncio.gather(*startup)
+            except Exception as e:
+                logger.error(f"Service init failed: {e}")
+                raise
+
+            # Set commands in Telegram off the startup path; the command menu
+            # doesn't need to be updated before the bot starts serving
+            self._commands_task = asyncio.create_task(self._set_commands())
 
-            # Initialize the application
-            await self.application.initialize()
             await self.application.start()
             
-            # Start polling in a background task
-            self._polling_task = asyncio.create_task(self._start_polling())
+            if env.USE_WEBHOOK:
+                # Telegram pushes updates to the FastAPI webhook route
+                await self._set_webhook()
+            else:
+                # Start polling in a background task (local development)
+                self._stopping = asyncio.Event()
+                self._polling_task = asyncio.create_task(self._start_polling())
             
             # Start alert checker in background
+            self._notification_queue = asyncio.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+            self._notification_workers = [
+                asyncio.create_task(self._notification_worker()) for _ in range(NOTIFICATION_WORKERS)
+            ]
+            # Fresh prices for watched symbols wake the checker early
+            self._alert_wakeup = asyncio.Event()
+            alert_service.set_wakeup_event(self._alert_wakeup)
+            price_service.set_price_listener(alert_service.notify_symbol_changed)
             self._alert_task = asyncio.create_task(self._check_alerts_loop())
             
             logger.info("Telegram bot initialized successfully")
@@ -78,162 +247,267 @@ class TelegramBot:
             raise
 
     async def _start_polling(self):
-        """Run polling in an infinite loop"""
-        try:
-            logger.info("Starting bot polling...")
-            await self.application.updater.start_polling()
-        except Exception as e:
-            logger.error(f"Polling error: {e}")
-            raise
+        """Fetch updates in batches and hand them to per-chat workers"""
+        logger.info("Starting bot polling...")
+        await self.bot.delete_webhook()
+        while not self._stopping.is_set():
+            try:
+                # Shielded so a shutdown never aborts a response mid-read; the
+                # handle lets shutdown cancel it once the grace period is over
+                self._poll_request = asyncio.ensure_future(self.bot.get_updates(
+                    offset=self._next_offset,
+                    limit=POLL_BATCH_SIZE,
+                    timeout=POLL_TIMEOUT,
+                    allowed_updates=Update.ALL_TYPES
+                ))
+                updates = await asyncio.shield(self._poll_request)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Polling error: {e}")
+                await asyncio.sleep(POLL_RETRY_DELAY)
+                continue
+
+            for update in updates:
+                self._dispatch_update(update)
+
+            # Advance the offset once updates are queued, not once they are handled,
+            # so a slow handler never holds back the next batch. The next getUpdates
+            # confirms this batch, so queued updates are not delivered again
+            if updates:
+                self._next_offset = updates[-1].update_id + 1
+
+    async def _stop_polling(self):
+        """Let the current batch finish, then stop fetching and dispatching updates"""
+        self._stopping.set()
+        done, _ = await asyncio.wait({self._polling_task}, timeout=POLL_SHUTDOWN_GRACE)
+        tasks = [task for task in (self._poll_request, self._polling_task) if task]
+        if not done:
+            # Abort the pending getUpdates so it can't overlap the confirming call
+            # or outlive the application. A batch it had not yet received was
+            # never confirmed, so Telegram delivers it on the next start
+            for task in tasks:
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
-    async def _send_loading_message(self, update: Update) -> Optional[Message]:
-        """Send a loading message and return it for later deletion"""
+    async def _drain_chat_queues(self):
+        """Wait for the chat workers to handle the updates already queued"""
+        queues = list(self._chat_queues.values())
+        if not queues:
+            return
         try:
-            # Use update.message if available, otherwise assume it's a callback_query and use update.callback_query.message
-            if update.message:
-                return await update.message.reply_text("⏳ Processing your request...")
-            elif update.callback_query and update.callback_query.message:
-                return await update.callback_query.message.reply_text("⏳ Processing your request...")
-            return None
-        except Exception as e:
-            logger.error(f"Error sending loading message: {e}")
-            return None
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in queues)),
+                timeout=UPDATE_DRAIN_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            # Earlier batches were already confirmed by later getUpdates calls,
+            # so these updates can't be redelivered
+            pending = sum(queue.qsize() for queue in queues)
+            logger.warning(f"Shutting down with unhandled updates; dropping {pending} queued updates")
 
-    async def _delete_message_safe(self, message: Optional[Message]):
-        """Safely delete a message"""
-        if message:
+    async def _confirm_updates(self):
+        """Confirm the last fetched batch so it isn't delivered again on the next start"""
+        if self._next_offset is not None:
             try:
-                await message.delete()
+                # getUpdates confirms every update below the offset it is given
+                await self.bot.get_updates(offset=self._next_offset, timeout=0)
             except Exception as e:
-                logger.error(f"Error deleting message: {e}")
+                logger.error(f"Failed to confirm fetched updates: {e}")
+
+    def _dispatch_update(self, update: Update):
+        """Queue an update on its chat's worker, starting the worker if needed"""
+        chat_id = update.effective_chat.id if update.effective_chat else None
+        queue = self._chat_queues.get(chat_id)
+        if queue is None:
+            queue = self._chat_queues[chat_id] = asyncio.Queue()
+            self._chat_workers[chat_id] = asyncio.create_task(self._chat_worker(chat_id, queue))
+        queue.put_nowait(update)
 
-    async def _register_handlers(self):
+    async def _chat_worker(self, chat_id: Optional[int], queue: asyncio.Queue):
+        """Process one chat's updates in order; exit once the chat goes idle"""
+        while True:
+            try:
+                update = await asyncio.wait_for(queue.get(), timeout=CHAT_WORKER_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                if queue.empty():
+                    del self._chat_queues[chat_id]
+                    del self._chat_workers[chat_id]
+                    return
+                continue
+            try:
+                await self.application.process_update(update)
+            except Exception as e:
+                logger.error(f"Error processing update {update.update_id}: {e}")
+            # Lets shutdown wait for the queue to drain
+            queue.task_done()
+
+    async def _set_webhook(self):
+        """Point Telegram at this app's webhook route"""
+        webhook_url = f"{env.WEBHOOK_URL.rstrip('/')}/api/webhook"
+        await self.bot.set_webhook(
+            url=webhook_url,
+            secret_token=env.WEBHOOK_SECRET,
+            allowed_updates=Update.ALL_TYPES
+        )
+        logger.info(f"Webhook set to {webhook_url}")
+
+    async def process_webhook_update(self, data: dict):
+        """Queue an update received on the webhook route for the application"""
+        if not self.application:
+            raise RuntimeError("Application not initialized")
+        await self.application.update_queue.put(Update.de_json(data, self.bot))
+
+    def _register_handlers(self):
         """Register command handlers"""
         if not self.application:
             raise RuntimeError("Application not initialized")
 
-        commands = [
-            ("start", "Start the bot", lambda u, c: start_command(u, c)),
-            ("help", "Show available commands", lambda u, c: help_command(u, c)),
-            ("price", "Get current price for a coin", lambda u, c: price_command(u, c, price_service)),
-            ("coins", "List supported coins", lambda u, c: coins_command(u, c, coin_service)),
-            ("history", "View price history", lambda u, c: price_history_command(u, c, price_service)),
-            ("headlines", "Get top 5 crypto headlines", lambda u, c: headlines_command(u, c, news_service)),
-            ("news", "Get latest crypto news with images and descriptions", lambda u, c: news_command(u, c, news_service)),
-            ("setalert", "Set price alert", lambda u, c: set_alert_command(u, c, alert_service, price_service)),
-            ("alerts", "View your active alerts", lambda u, c: list_alerts_command(u, c, alert_service, price_service)),
-            ("delalert", "Delete an alert", lambda u, c: delete_alert_command(u, c, alert_service)),
+        # Semaphores are created here, inside the running event loop. Buttons
+        # share them with the command of the same name, so "Show More" and
+        # refresh buttons can't bypass the limit
+        limits = {command: asyncio.Semaphore(limit) for command, limit in COMMAND_CONCURRENCY.items()}
+        handlers = [
+            (command, _limit_concurrency(handler, limits[command]) if command in limits else handler)
+            for command, _, handler in _COMMANDS
         ]
 
-        # Register command handlers
-        for command, _, handler in commands:
-            self.application.add_handler(CommandHandler(command, handler))
-        
-        # Register callback query handler
-        self.application.add_handler(CallbackQueryHandler(lambda u, c: button_callback(u, c, price_service, coin_service)))
-
-        # Set commands in Telegram
-        await self.bot.set_my_commands([
-            (command, description) for command, description, _ in commands
+        # Register command handlers and the callback query handler in one batch
+        self.application.add_handlers([
+            *(CommandHandler(command, handler) for command, handler in handlers),
+            CallbackQueryHandler(partial(
+                button_callback,
+                price_service_instance=price_service,
+                coin_service_instance=coin_service,
+                limits=limits
+            ))
         ])
 
         logger.info("Command handlers registered")
 
+    async def _set_commands(self):
+        """Publish the command menu to Telegram"""
+        try:
+            await self.bot.set_my_commands(_BOT_COMMANDS)
+        except Exception as e:
+            logger.error(f"Failed to set bot commands: {e}")
+
     async def _check_alerts_loop(self):
-        """Periodically check alerts in background with improved notification formatting"""
+        """Check alerts when watched prices change, and periodically as a fallback"""
         while True:
+            # Schedule the next check from when this one started, not from when
+            # it finished, so time spent checking and queueing doesn't add drift
+            started = time.monotonic()
             try:
                 triggered_alerts = await alert_service.check_alerts()
+                # Prices fetched by the check itself have just been evaluated
+                self._alert_wakeup.clear()
                 
-                # Process notifications in parallel
-                tasks = []
+                # One message per user (split only at Telegram's length limit)
+                # instead of one per alert
+                by_user = defaultdict(list)
                 for alert in triggered_alerts:
-                    symbol = alert['symbol'].upper()
-                    target_price = alert['target_price']
-                    current_price = alert['current_price']
-                    price_diff = ((current_price - target_price) / target_price * 100)
-                    condition = alert['condition']
-                    
-                    # Get additional price data if available
-                    price_data_info = alert.get('price_data', {})
-                    high_24h = price_data_info.get('high_24h', 0)
-                    low_24h = price_data_info.get('low_24h', 0)
-                    change_24h = price_data_info.get('change_24h', 0)
-                    
-                    # Determine direction emoji and status
-                    direction_emoji = '📈' if condition == 'above' else '📉'
-                    
-                    # Format the alert message with markdown
-                    message = (
-                        f"{direction_emoji} *PRICE ALERT* {direction_emoji}\n\n"
-                        f"• *{symbol}* is now *{condition.upper()}* your target price!\n\n"
-                        f"🎯 *Target:* ${target_price:,.2f} ({condition})\n"
-                        f"💰 *Current:* ${current_price:,.2f} ({price_diff:+.2f}%)"
-                    )
-                    
-                    # Add 24h stats if available
-                    if high_24h or low_24h:
-                        message += (
-                            f"\n\n📊 *24h Stats:*\n"
-                            f"• High: ${high_24h:,.2f}\n"
-                            f"• Low: ${low_24h:,.2f}\n"
-                            f"• Change: {change_24h:+.2f}%"
-                        )
-                    
-                    # Add action buttons
-                    message += "\n\n🔔 Use /alerts to manage your alerts"
-                    
-                    # Send the notification
-                    tasks.append(
-                        notification_service.send_message(
-                            chat_id=alert['user_id'],
-                            text=message,
-                            parse_mode=ParseMode.MARKDOWN
-                        )
-                    )
+                    by_user[alert['user_id']].append(_format_alert(alert))
+                notifications = [
+                    (user_id, text)
+                    for user_id, messages in by_user.items()
+                    for text in split_message(messages, _ALERT_SEPARATOR)
+                ]
                 
-                # Send all notifications in parallel
-                if tasks:
-                    await asyncio.gather(*tasks, return_exceptions=True)
+                # Blocks while the queue is full, so the checker can't outrun the senders
+                for notification in notifications:
+                    await self._notification_queue.put(notification)
                 
-                # Wait for 1 minute before next check
-                await asyncio.sleep(60)
+                # Sleep until an alert could plausibly trigger, but never longer
+                # than the regular interval
+                delay = alert_service.seconds_until_next_possible_trigger()
+                if delay is None:
+                    delay = ALERT_CHECK_INTERVAL
+                delay = max(ALERT_CHECK_MIN_DELAY, min(delay, ALERT_CHECK_INTERVAL))
+                # If the check overran its slot, start the next one right away.
+                # A fresh price for a watched symbol ends the wait early
+                try:
+                    await asyncio.wait_for(
+                        self._alert_wakeup.wait(),
+                        timeout=max(0, started + delay - time.monotonic())
+                    )
+                    await asyncio.sleep(ALERT_WAKEUP_DEBOUNCE)
+                except asyncio.TimeoutError:
+                    pass
             
             except Exception as e:
                 logger.error(f"Error in alert checker loop: {e}")
                 await asyncio.sleep(60)  # Wait before retrying
 
+    async def _notification_worker(self):
+        """Send queued (chat_id, text) alert notifications"""
+        send = notification_service.send_message
+        while True:
+            chat_id, text = await self._notification_queue.get()
+            # Log failures here so one bad send doesn't stop the worker
+            try:
+                # A hung send gives up its worker instead of stalling the queue
+                sent = await asyncio.wait_for(
+                    send(chat_id=chat_id, text=text, parse_mode=_PARSE_MD),
+                    timeout=NOTIFICATION_SEND_TIMEOUT
+                )
+                # send_message logs and swallows its own errors; report which chat missed out
+                if not sent:
+                    logger.warning(f"Alert send failed for {chat_id}")
+            except Exception as e:
+                logger.warning(f"Alert send failed for {chat_id}: {e}")
+            finally:
+                self._notification_queue.task_done()
+
+    async def _stop_application(self):
+        """Stop and shut down the application; shutdown must follow stop"""
+        if self.application:
+            await self.application.stop()
+            await self.application.shutdown()
+
     async def shutdown(self):
         """Shutdown the bot and clean up resources"""
         try:
             if self._polling_task:
-                self._polling_task.cancel()
-                try:
-                    await self._polling_task
-                except asyncio.CancelledError:
-                    pass
+                # Stop dispatching first, let the chat workers finish what is
+                # queued, then confirm the last fetched batch
+                await self._stop_polling()
+                await self._drain_chat_queues()
+                await self._confirm_updates()
 
-            if self._alert_task:
-                self._alert_task.cancel()
-                try:
-                    await self._alert_task
-                except asyncio.CancelledError:
-                    pass
+            # Nothing is dispatched any more, so this covers every background
+            # task; pending notifications and unhandled updates are dropped
+            tasks = [task for task in (self._alert_task, self._commands_task) if task]
+            tasks.extend(self._notification_workers)
+            tasks.extend(self._chat_workers.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-            if self.application:
-                await self.application.stop()
-                await self.application.shutdown()
-            
-            # Cleanup services
-            await price_service.close()
-            await news_service.close()
-            await db.disconnect()  # Close database connection
-            await self.cache.close()
+            # Stop the application and clean up services concurrently; one
+            # failing close doesn't skip the others
+            results = await asyncio.gather(
+                self._stop_application(),
+                price_service.close(),
+                news_service.close(),
+                coin_service.close(),
+                coingecko_service.close(),
+                self.cache.close(),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error closing service: {result}")
+
+            # Close the shared HTTP session once no service is using it
+            if self._http:
+                await self._http.close()
+                self._http = None
             
             logger.info("Telegram bot shut down successfully")
         except Exception as e:
             logger.error(f"Error during shutdown: {e}")
             raise
 
-# Create singleton instance
+# Create the bot instance shared by main.py and the API routes
 bot_instance = TelegramBot()
\ No newline at end of file
@@ -15,24 +15,27 @@ from app.services.price_service import price_service
 from app.services.notification_service import notification_service
 
 class AlertService:
-    _instance: Optional['AlertService'] = None
-    _initialized: bool = False
     ALERT_CHECK_INTERVAL = 60  # Check every minute
     PRICE_CACHE_TTL = 60  # Cache prices for 1 minute
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(AlertService, cls).__new__(cls)
-        return cls._instance
-
     def __init__(self):
-        if not self._initialized:
-            self.cache = CacheService()
-            self._initialized = True
-            self._running = False
-            self._task: Optional[asyncio.Task] = None
-            self._alert_key_prefix = "crypto_alert:"
-            self._user_alerts_key_prefix = "user_alerts:"
+        self.cache = CacheService()
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+        self._alert_key_prefix = "crypto_alert:"
+        self._user_alerts_key_prefix = "user_alerts:"
+        self._next_trigger_estimate: Optional[float] = None
+        self._tracked_symbols: Set[str] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def set_wakeup_event(self, event: Optional[asyncio.Event]):
+        """Set the event the alert checker waits on between checks"""
+        self._wakeup = event
+
+    def notify_symbol_changed(self, symbol: str):
+        """Wake the alert checker if an active alert watches this symbol"""
+        if self._wakeup and symbol.upper() in self._tracked_symbols:
+            self._wakeup.set()
 
     async def start_monitoring(self):
         """Start the alert monitoring loop"""
@@ -254,13 +257,10 @@ class AlertService:
                 alert_key = f"{self._alert_key_prefix}{alert_id}"
                 alert_data = await self.cache.get_key(alert_key)
                 
+                # Prices are not refreshed here; /alerts fetches them for all
+                # symbols in one batch and falls back to the stored current_price
                 if alert_data:
-                    alert = alert_data
-                    # Get current price
-                    price_data = await price_service.get_price(alert["symbol"])
-                    if "error" not in price_data:
-                        alert["current_price"] = price_data["price_usd"]
-                    alerts.append(alert)
+                    alerts.append(alert_data)
 
             return sorted(alerts, key=lambda x: x["created_at"], reverse=True)
 
@@ -276,10 +276,8 @@ class AlertService:
 
             # Check if alert exists and belongs to user
             alert = await self.cache.get_key(alert_key)
-            if not alert:
-                return {"error": "Alert not found"}
-            if alert["user_id"] != user_id:
-                return {"error": "Alert not found"}
+            if not alert or alert["user_id"] != user_id:
+                return {"error": "Alert not found", "not_found": True}
 
             # Delete alert
             await self.cache.delete_key(alert_key)
@@ -287,7 +285,8 @@ class AlertService:
 
             return {
                 "success": True,
-                "message": f"✅ Alert for {alert['symbol']} deleted successfully"
+                "message": f"✅ Alert for {alert['symbol']} deleted successfully",
+                "alert": alert
             }
 
         except Exception as e:
@@ -298,6 +297,8 @@ class AlertService:
         """Check all alerts against current prices and return triggered alerts"""
         try:
             triggered_alerts = []
+            estimates = []
+            tracked_symbols = set()
             # Get all user alert keys
             user_keys = await self.cache.scan_keys(f"{self._user_alerts_key_prefix}*")
             
@@ -315,13 +316,39 @@ class AlertService:
                             triggered_alerts.append(alert)
                             # Delete triggered alert
                             await self.delete_alert(user_id, alert_id)
-
+                        else:
+                            tracked_symbols.add(alert.get("symbol", "").upper())
+                            estimate = self._estimate_seconds_to_trigger(alert)
+                            if estimate is not None:
+                                estimates.append(estimate)
+
+            self._next_trigger_estimate = min(estimates) if estimates else None
+            self._tracked_symbols = tracked_symbols
             return triggered_alerts
 
         except Exception as e:
             logger.error(f"Error checking alerts: {e}")
             return []
 
+    def seconds_until_next_possible_trigger(self) -> Optional[float]:
+        """Estimated seconds until any alert could trigger, from the last check_alerts run; None if unknown"""
+        return self._next_trigger_estimate
+
+    @staticmethod
+    def _estimate_seconds_to_trigger(alert: Dict[str, Any]) -> Optional[float]:
+        """Time for the price to reach the target if it keeps moving at its average 24h rate"""
+        try:
+            current_price = float(alert["current_price"])
+            target_price = float(alert["target_price"])
+            change_24h = float(alert.get("price_data", {}).get("change_24h") or 0)
+        except (KeyError, TypeError, ValueError):
+            return None
+        if current_price <= 0 or not change_24h:
+            return None
+        # Average price movement per second over the last 24h
+        rate = current_price * abs(change_24h) / 100 / 86400
+        return abs(target_price - current_price) / rate
+
     async def _check_alert(self, alert: Dict[str, Any]) -> bool:
         """Check if an alert should be triggered"""
         try:
@@ -331,15 +358,13 @@ class AlertService:
                 return False
                 
             # Get current price data
-            price_data = await price_service.get_price(symbol)
-            if not price_data or "error" in price_data:
-                logger.error(f"Failed to get price for {symbol}: {price_data.get('error', 'Unknown error')}")
-                return False
+            price_data = await price_service.get_price(symbol) or {}
 
-            # Get the current price from the price data
+            # Error results carry no price, so one lookup covers both cases on
+            # the per-alert path; the error key is only read when logging
             current_price = price_data.get("price_usd")
             if current_price is None:
-                logger.error(f"No price data available for {symbol}")
+                logger.error(f"Failed to get price for {symbol}: {price_data.get('error', 'No price data available')}")
                 return False
 
             target_price = alert.get("target_price")
@@ -411,32 +436,8 @@ class AlertService:
             
             logger.info(f"[set_alert] Validated condition: {condition}")
 
-            # Get current price data
-            logger.info(f"[set_alert] Fetching price for {symbol}...")
-            price_data = await price_service.get_price(symbol)
-            logger.info(f"[set_alert] Price data received: {price_data}")
-            
-            # Check for error in price data
-            if not price_data:
-                error_msg = "No price data received from price service"
-                logger.error(f"[set_alert] {error_msg}")
-                return {"error": "❌ Failed to fetch price data. Please try again later."}
-                
-            if isinstance(price_data, dict) and "error" in price_data:
-                error_msg = price_data.get("error", "Unknown error from price service")
-                logger.error(f"[set_alert] Price service error: {error_msg}")
-                return {"error": f"❌ {error_msg}. Please check the symbol and try again."}
-
-            # Get the current price from the price data
-            current_price = price_data.get("price_usd")
-            logger.info(f"[set_alert] Extracted price: {current_price}")
-            
-            if current_price is None:
-                error_msg = f"No price data in response for {symbol}"
-                logger.error(f"[set_alert] {error_msg}")
-                return {"error": "❌ Could not determine current price for the symbol. Please try again."}
-
-            # Check for duplicate alert
+            # Check for duplicate alert before fetching the price, which a
+            # duplicate would never use
             user_alerts_key = f"{self._user_alerts_key_prefix}{user_id}"
             logger.info(f"[set_alert] Checking for duplicate alerts with key: {user_alerts_key}")
             
@@ -462,6 +463,31 @@ class AlertService:
                 logger.error(f"[set_alert] Error checking for duplicate alerts: {e}")
                 # Continue with alert creation even if duplicate check fails
 
+            # Get current price data
+            logger.info(f"[set_alert] Fetching price for {symbol}...")
+            price_data = await price_service.get_price(symbol)
+            logger.info(f"[set_alert] Price data received: {price_data}")
+            
+            # Check for error in price data
+            if not price_data:
+                error_msg = "No price data received from price service"
+                logger.error(f"[set_alert] {error_msg}")
+                return {"error": "❌ Failed to fetch price data. Please try again later."}
+                
+            if isinstance(price_data, dict) and "error" in price_data:
+                error_msg = price_data.get("error", "Unknown error from price service")
+                logger.error(f"[set_alert] Price service error: {error_msg}")
+                return {"error": f"❌ {error_msg}. Please check the symbol and try again."}
+
+            # Get the current price from the price data
+            current_price = price_data.get("price_usd")
+            logger.info(f"[set_alert] Extracted price: {current_price}")
+            
+            if current_price is None:
+                error_msg = f"No price data in response for {symbol}"
+                logger.error(f"[set_alert] {error_msg}")
+                return {"error": "❌ Could not determine current price for the symbol. Please try again."}
+
             # Create alert data
             alert_id = f"{int(time.time())}_{user_id}_{symbol}"
             alert_data = {
@@ -484,6 +510,7 @@ class AlertService:
                 # Store alert data and add to user's alert list
                 await self.cache.set_key(alert_key, alert_data)
                 await self.cache.sadd(user_alerts_key, alert_id)
+                self._tracked_symbols.add(symbol)
                 logger.info("[set_alert] Alert saved successfully")
                 
                 # Format the response message
@@ -505,7 +532,8 @@ class AlertService:
                 return {
                     "success": True,
                     "message": success_msg,
-                    "alert_id": alert_id
+                    "alert_id": alert_id,
+                    "current_price": current_price
                 }
                 
             except Exception as e:
@@ -1,6 +1,7 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-import httpx
+import aiohttp
+import orjson
 from loguru import logger
 
 from app.models.coin import CoinCreate, CoinUpdate, CoinInDB
@@ -8,18 +9,23 @@ from app.services.cache_service import CacheService
 from app.core.db import db
 
 class CoinService:
-    _instance: Optional['CoinService'] = None
-    _initialized: bool = False
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(CoinService, cls).__new__(cls)
-        return cls._instance
-    
     def __init__(self):
-        if not self._initialized:
-            self.cache = CacheService()
-            self._initialized = True
+        self.cache = CacheService()
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._owns_session = False
+
+    async def initialize(self, session: Optional[aiohttp.ClientSession] = None):
+        """Initialize the HTTP session, reusing a shared one if given"""
+        if not self.session:
+            self._owns_session = session is None
+            self.session = session or aiohttp.ClientSession()
+
+    async def close(self):
+        """Close the HTTP session if this service created it"""
+        if self.session:
+            if self._owns_session:
+                await self.session.close()
+            self.session = None
     
     async def get_coins(
         self, 
@@ -89,15 +95,17 @@ class CoinService:
             "order": "market_cap_desc",
             "per_page": 250,
             "page": 1,
-            "sparkline": False,
+            "sparkline": "false",
             "price_change_percentage": "24h"
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params)
+            if not self.session:
+                await self.initialize()
+
+            async with self.session.get(url, params=params) as response:
                 response.raise_for_status()
-                return response.json()
+                return await response.json(loads=orjson.loads)
         except Exception as e:
             logger.error(f"Error fetching coins from API: {e}")
             return []
@@ -107,39 +115,34 @@ class CoinService:
         if not coins_data:
             return
             
-        for coin_data in coins_data:
-            coin_id = coin_data.get('id')
-            if not coin_id:
-                continue
+        # All upserts go to the database as one batched query instead of a
+        # lookup plus a write per coin
+        now = datetime.utcnow()
+        async with db.prisma.batch_() as batcher:
+            for coin_data in coins_data:
+                coin_id = coin_data.get('id')
+                if not coin_id:
+                    continue
+                    
+                # Prepare coin data
+                coin_update = {
+                    "symbol": coin_data.get('symbol', '').lower(),
+                    "name": coin_data.get('name', ''),
+                    "current_price": coin_data.get('current_price'),
+                    "price_change_percentage_24h": coin_data.get('price_change_percentage_24h'),
+                    "market_cap": coin_data.get('market_cap'),
+                    "total_volume": coin_data.get('total_volume'),
+                    "image": coin_data.get('image'),
+                    "last_updated": now
+                }
                 
-            # Prepare coin data
-            coin_update = {
-                "symbol": coin_data.get('symbol', '').lower(),
-                "name": coin_data.get('name', ''),
-                "current_price": coin_data.get('current_price'),
-                "price_change_percentage_24h": coin_data.get('price_change_percentage_24h'),
-                "market_cap": coin_data.get('market_cap'),
-                "total_volume": coin_data.get('total_volume'),
-                "image": coin_data.get('image'),
-                "last_updated": datetime.utcnow()
-            }
-            
-            # Update or create coin
-            # Check if coin exists
-            existing = await db.prisma.coin.find_unique(
-                where={"coin_id": coin_id}
-            )
-            
-            if existing:
-                # Update existing coin
-                await db.prisma.coin.update(
+                # Update the coin, or create it if it doesn't exist yet
+                batcher.coin.upsert(
                     where={"coin_id": coin_id},
-                    data=coin_update
-                )
-            else:
-                # Create new coin
-                await db.prisma.coin.create(
-                    data={"coin_id": coin_id, **coin_update}
+                    data={
+                        "create": {"coin_id": coin_id, **coin_update},
+                        "update": coin_update
+                    }
                 )
 
 # Create singleton instance
@@ -1,5 +1,6 @@
 from typing import Dict, Optional, List
 import httpx
+import orjson
 from loguru import logger
 from datetime import datetime
 import asyncio
@@ -8,43 +9,41 @@ from env import env
 from app.models.schemas import MarketData
 from app.services.cache_service import CacheService
 
+_INF = float('inf')
+
+def _trending_sort_key(coin: Dict) -> tuple:
+    """Order trending coins by market cap rank (unranked last), then by score"""
+    rank = coin["market_cap_rank"]
+    return (rank if rank is not None else _INF, -coin.get("score", 0))
+
 class CoinGeckoService:
-    _instance: Optional['CoinGeckoService'] = None
-    _initialized: bool = False
     BASE_URL = "https://api.coingecko.com/api/v3"
     RATE_LIMIT_DELAY = 1.5  # Delay between requests in seconds
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(CoinGeckoService, cls).__new__(cls)
-        return cls._instance
-
     def __init__(self):
-        if not self._initialized:
-            self.api_key = env.COINGECKO_API_KEY
-            self.client = httpx.AsyncClient(
-                base_url=self.BASE_URL,
-                timeout=30.0,
-                headers={
-                    "X-CoinGecko-API-Key": self.api_key
-                } if self.api_key else {}
-            )
-            self.cache = CacheService()
-            self.last_request_time = 0
-            self._initialized = True
-            # Common symbol to ID mappings
-            self.symbol_mappings = {
-                "btc": "bitcoin",
-                "eth": "ethereum",
-                "usdt": "tether",
-                "bnb": "binancecoin",
-                "xrp": "ripple",
-                "ada": "cardano",
-                "doge": "dogecoin",
-                "sol": "solana",
-                "dot": "polkadot",
-                "ltc": "litecoin"
-            }
+        self.api_key = env.COINGECKO_API_KEY
+        self.client = httpx.AsyncClient(
+            base_url=self.BASE_URL,
+            timeout=30.0,
+            headers={
+                "X-CoinGecko-API-Key": self.api_key
+            } if self.api_key else {}
+        )
+        self.cache = CacheService()
+        self.last_request_time = 0
+        # Common symbol to ID mappings
+        self.symbol_mappings = {
+            "btc": "bitcoin",
+            "eth": "ethereum",
+            "usdt": "tether",
+            "bnb": "binancecoin",
+            "xrp": "ripple",
+            "ada": "cardano",
+            "doge": "dogecoin",
+            "sol": "solana",
+            "dot": "polkadot",
+            "ltc": "litecoin"
+        }
 
     async def close(self):
         """Close HTTP client"""
@@ -72,7 +71,7 @@ class CoinGeckoService:
                 params={"query": symbol}
             )
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             coins = data.get("coins", [])
             if not coins:
@@ -114,7 +113,7 @@ class CoinGeckoService:
                 }
             )
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             if coin_id not in data:
                 return None
@@ -152,7 +151,7 @@ class CoinGeckoService:
                 }
             )
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             market_data = data.get("market_data", {})
             return {
@@ -171,7 +170,7 @@ class CoinGeckoService:
             
             response = await self.client.get("/search/trending")
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             result = []
             btc_price = await self._get_btc_price()  # Get BTC price once for all conversions
@@ -199,7 +198,7 @@ class CoinGeckoService:
                             }
                         )
                         price_response.raise_for_status()
-                        price_data = price_response.json().get(coin_id, {})
+                        price_data = orjson.loads(price_response.content).get(coin_id, {})
                         
                         # Cache the price data for 1 minute
                         await self.cache.set_key(cache_key, price_data, expiry=60)
@@ -223,10 +222,7 @@ class CoinGeckoService:
                     continue
 
             # Sort by market cap rank if available, otherwise by score
-            result.sort(key=lambda x: (
-                x["market_cap_rank"] if x["market_cap_rank"] is not None else float('inf'),
-                -x.get("score", 0)
-            ))
+            result.sort(key=_trending_sort_key)
 
             return result[:10]  # Ensure we return at most 10 coins
 
@@ -263,7 +259,7 @@ class CoinGeckoService:
                 }
             )
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             price = float(data["bitcoin"]["usd"])
             
@@ -281,7 +277,7 @@ class CoinGeckoService:
         try:
             response = await self.client.get("/coins/list")
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
 
         except Exception as e:
             logger.error(f"Error fetching supported coins: {e}")
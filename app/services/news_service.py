@@ -4,16 +4,13 @@ from datetime import datetime, timedelta
 from loguru import logger
 import aiohttp
 import random
-import json
+import orjson
 
 from env import env
 from app.models.schemas import NewsItem
 from app.services.cache_service import CacheService
 
 class NewsService:
-    _instance: Optional['NewsService'] = None
-    _initialized: bool = False
-    
     # API Endpoints
     COINDESK_BASE_URL = "https://api.coindesk.com/v2"
     CRYPTOCOMPARE_BASE_URL = "https://min-api.cryptocompare.com/data/v2"
@@ -24,26 +21,22 @@ class NewsService:
     # Service flags
     use_coindesk: bool = True
     
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(NewsService, cls).__new__(cls)
-        return cls._instance
-
     def __init__(self):
-        if not self._initialized:
-            self.cache = CacheService()
-            self.session: Optional[aiohttp.ClientSession] = None
-            self._initialized = True
+        self.cache = CacheService()
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._owns_session = False
 
-    async def initialize(self):
-        """Initialize the HTTP session"""
+    async def initialize(self, session: Optional[aiohttp.ClientSession] = None):
+        """Initialize the HTTP session, reusing a shared one if given"""
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self._owns_session = session is None
+            self.session = session or aiohttp.ClientSession()
 
     async def close(self):
-        """Close the HTTP session"""
+        """Close the HTTP session if this service created it"""
         if self.session:
-            await self.session.close()
+            if self._owns_session:
+                await self.session.close()
             self.session = None
 
     async def _fetch_news_data(self) -> List[Dict[str, Any]]:
@@ -105,7 +98,7 @@ class NewsService:
                 logger.error(f"CoinDesk API error: {response.status}")
                 return []
                 
-            data = await response.json()
+            data = await response.json(loads=orjson.loads)
             articles = data.get("data", {}).get("news", [])
             
             return [{
@@ -127,7 +120,7 @@ class NewsService:
                 logger.error(f"CryptoCompare API error: {response.status}")
                 return []
                 
-            data = await response.json()
+            data = await response.json(loads=orjson.loads)
             if data.get("Type") == 100 and "Data" in data:
                 return data["Data"]
             return []
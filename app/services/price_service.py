@@ -1,25 +1,57 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Awaitable
 
+import asyncio
 import aiohttp
+import orjson
 from loguru import logger
 from datetime import datetime, timedelta
 
 from env import env
+from app.services.cache_service import CacheService
 
 class PriceService:
+    PRICE_CACHE_TTL = 60  # Cache single-symbol prices for 1 minute
+    HISTORY_CACHE_TTL = 300  # Cache price history for 5 minutes
+
     def __init__(self):
         self.base_url = "https://api.coingecko.com/api/v3"
         self.session: Optional[aiohttp.ClientSession] = None
-
-    async def initialize(self):
-        """Initialize the HTTP session"""
+        self._owns_session = False
+        self.cache = CacheService()
+        self._price_listener: Optional[Callable[[str], None]] = None
+        # In-flight upstream fetches by cache key
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def set_price_listener(self, listener: Optional[Callable[[str], None]]):
+        """Set a callback invoked with the symbol whenever a fresh price is fetched"""
+        self._price_listener = listener
+
+    def _notify_price(self, symbol: str):
+        """Tell the listener a fresh price for the symbol is cached"""
+        if self._price_listener:
+            self._price_listener(symbol)
+
+    def _single_flight(self, cache_key: str, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Awaitable[Dict[str, Any]]:
+        """Share one upstream fetch between callers that miss the same cache key"""
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        # Shielded so one caller being cancelled doesn't cancel the others' fetch
+        return asyncio.shield(task)
+
+    async def initialize(self, session: Optional[aiohttp.ClientSession] = None):
+        """Initialize the HTTP session, reusing a shared one if given"""
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self._owns_session = session is None
+            self.session = session or aiohttp.ClientSession()
 
     async def close(self):
-        """Close the HTTP session"""
+        """Close the HTTP session if this service created it"""
         if self.session:
-            await self.session.close()
+            if self._owns_session:
+                await self.session.close()
             self.session = None
 
     async def get_supported_coins(self) -> Dict[str, Any]:
@@ -35,7 +67,7 @@ class PriceService:
                 elif response.status != 200:
                     return {"error": "Failed to fetch supported coins"}
 
-                data = await response.json()
+                data = await response.json(loads=orjson.loads)
                 
                 # Sort by symbol
                 coins = sorted(data, key=lambda x: x['symbol'])
@@ -49,12 +81,25 @@ class PriceService:
 
     async def get_price_history(self, symbol: str, days: int = 7) -> Dict[str, Any]:
         """Get historical price data for a cryptocurrency"""
+        # Normalized once; used for the cache key and the coin ID lookup
+        key = symbol.lower()
+        cache_key = f"price_history:{key}:{days}"
+        cached_data = await self.cache.get_key(cache_key)
+        if cached_data:
+            return cached_data
+
+        return await self._single_flight(
+            cache_key, lambda: self._fetch_price_history(symbol, key, days, cache_key)
+        )
+
+    async def _fetch_price_history(self, symbol: str, key: str, days: int, cache_key: str) -> Dict[str, Any]:
+        """Fetch historical price data from the API and cache it"""
         try:
             if not self.session:
                 await self.initialize()
 
             # Get coin ID first
-            coin_id = await self._get_coin_id(symbol.lower())
+            coin_id = await self._get_coin_id(key)
             if not coin_id:
                 return {"error": f"Cryptocurrency {symbol} not found"}
 
@@ -72,7 +117,7 @@ class PriceService:
                 elif response.status != 200:
                     return {"error": "Failed to fetch price history"}
 
-                data = await response.json()
+                data = await response.json(loads=orjson.loads)
 
                 # Process historical data
                 history = []
@@ -92,10 +137,12 @@ class PriceService:
                         "change_24h": change_24h
                     })
 
-                return {
+                result = {
                     "symbol": symbol.upper(),
                     "history": history
                 }
+                await self.cache.set_key(cache_key, result, expiry=self.HISTORY_CACHE_TTL)
+                return result
 
         except Exception as e:
             logger.error(f"Error fetching price history for {symbol}: {e}")
@@ -103,12 +150,25 @@ class PriceService:
 
     async def get_price(self, symbol: str) -> Dict[str, Any]:
         """Get current price and 24h stats for a cryptocurrency"""
+        # Normalized once; used for the cache key and the coin ID lookup
+        key = symbol.lower()
+        cache_key = f"price_data:{key}"
+        cached_data = await self.cache.get_key(cache_key)
+        if cached_data:
+            return cached_data
+
+        return await self._single_flight(
+            cache_key, lambda: self._fetch_price(symbol, key, cache_key)
+        )
+
+    async def _fetch_price(self, symbol: str, key: str, cache_key: str) -> Dict[str, Any]:
+        """Fetch current price and 24h stats from the API and cache them"""
         try:
             # Ensure HTTP session is initialized
             if not self.session:
                 await self.initialize()
             # Convert common symbols to CoinGecko IDs
-            coin_id = await self._get_coin_id(symbol.lower())
+            coin_id = await self._get_coin_id(key)
             if not coin_id:
                 return {"error": f"Cryptocurrency {symbol} not found"}
 
@@ -128,18 +188,21 @@ class PriceService:
                 elif response.status != 200:
                     return {"error": "Failed to fetch price data"}
 
-                data = await response.json()
+                data = await response.json(loads=orjson.loads)
                 if coin_id not in data:
                     return {"error": f"No price data available for {symbol}"}
 
                 price_data = data[coin_id]
-                return {
+                result = {
                     "symbol": symbol.upper(),
                     "price_usd": price_data["usd"],
                     "change_24h": price_data.get("usd_24h_change", 0),
                     "volume_24h": price_data.get("usd_24h_vol", 0),
                     "market_cap": price_data.get("usd_market_cap", 0)
                 }
+                await self.cache.set_key(cache_key, result, expiry=self.PRICE_CACHE_TTL)
+                self._notify_price(result["symbol"])
+                return result
 
         except Exception as e:
             logger.error(f"Error fetching price for {symbol}: {e}")
@@ -172,7 +235,7 @@ class PriceService:
                 if response.status != 200:
                     return None
 
-                data = await response.json()
+                data = await response.json(loads=orjson.loads)
                 coins = data.get("coins", [])
                 
                 if not coins:
@@ -222,7 +285,7 @@ class PriceService:
                 if response.status != 200:
                     logger.error(f"Failed to fetch multi-price data: HTTP {response.status}")
                     return {}
-                data = await response.json()
+                data = await response.json(loads=orjson.loads)
 
             # Build result mapping in expected format
             results: Dict[str, Any] = {}
@@ -235,11 +298,47 @@ class PriceService:
                         "volume_24h": coin_data.get("usd_24h_vol", 0),
                         "market_cap": coin_data.get("usd_market_cap", 0)
                     }
+                    # Cached the way get_price caches, so either call serves the other
+                    if coin_data.get("usd") is not None:
+                        await self.cache.set_key(
+                            f"price_data:{sym_upper.lower()}",
+                            {
+                                "symbol": sym_upper,
+                                "price_usd": coin_data["usd"],
+                                "change_24h": results[sym_upper]["change_24h"],
+                                "volume_24h": results[sym_upper]["volume_24h"],
+                                "market_cap": results[sym_upper]["market_cap"]
+                            },
+                            expiry=self.PRICE_CACHE_TTL
+                        )
+                        self._notify_price(sym_upper)
             return results
         except Exception as e:
             logger.error(f"Error fetching prices for symbols {symbols}: {e}")
             return {}
 
+    async def get_cached_prices(self, symbols: List[str]) -> Dict[str, Any]:
+        """Return the cached prices for the given symbols without calling the API.
+
+        Uses the same result format as `get_prices`; symbols without a
+        cached price are left out.
+        """
+        try:
+            cached: Dict[str, Any] = {}
+            for sym in symbols:
+                data = await self.cache.get_key(f"price_data:{sym.lower()}")
+                if data:
+                    cached[sym.upper()] = {
+                        "price": data["price_usd"],
+                        "change_24h": data.get("change_24h", 0),
+                        "volume_24h": data.get("volume_24h", 0),
+                        "market_cap": data.get("market_cap", 0)
+                    }
+            return cached
+        except Exception as e:
+            logger.error(f"Error reading cached prices: {e}")
+            return {}
+
     async def get_current_price(self, symbol: str) -> Optional[float]:
         """Return only the current USD price for the given symbol.
 
@@ -249,7 +348,8 @@ class PriceService:
         """
         try:
             data = await self.get_price(symbol)
-            if data and "error" not in data:
+            # Error results carry no price_usd, so the lookup alone tells them apart
+            if data:
                 return data.get("price_usd")
         except Exception as e:
             logger.error(f"Error fetching current price for {symbol}: {e}")
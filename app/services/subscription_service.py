@@ -1,4 +1,4 @@
-from typing import List, Dict, Optional
+from typing import List, Dict
 from loguru import logger
 from datetime import datetime
 
@@ -8,18 +8,6 @@ from app.services.notification_service import notification_service
 from app.models.schemas import Subscription, NewsItem, SubscriptionTier
 
 class SubscriptionService:
-    _instance: Optional['SubscriptionService'] = None
-    _initialized: bool = False
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(SubscriptionService, cls).__new__(cls)
-        return cls._instance
-
-    def __init__(self):
-        if not self._initialized:
-            self._initialized = True
-
     async def create_subscription(self, user_id: str, symbol: str) -> Subscription:
         """Create a new subscription"""
         try:
@@ -159,7 +147,8 @@ class SubscriptionService:
 
     def _format_news_message(self, symbol: str, news_items: List[NewsItem]) -> str:
         """Format news items into a message"""
-        message = f"📰 Latest News for {symbol}\n\n"
+        parts = [f"📰 Latest News for {symbol}\n\n"]
+        append = parts.append
 
         for item in news_items[:5]:  # Limit to 5 news items
             sentiment = ""
@@ -171,13 +160,13 @@ class SubscriptionService:
                 else:
                     sentiment = "⚪️"
 
-            message += (
+            append(
                 f"{sentiment} <b>{item.title}</b>\n"
                 f"Source: {item.source}\n"
                 f"<a href='{item.url}'>Read more</a>\n\n"
             )
 
-        return message
+        return "".join(parts)
 
     def _get_max_subscriptions(self, tier: str) -> int:
         """Get maximum allowed subscriptions for tier"""
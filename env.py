@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from dotenv import load_dotenv
 from typing import Optional, Any, Dict
 
@@ -20,15 +21,23 @@ class Environment:
 
         # Database
         self.DATABASE_URL = os.getenv("DATABASE_URL", "")
+        # Prisma's recommended pool size is num_cpus * 2 + 1
+        self.DB_CONNECTION_LIMIT = int(os.getenv("DB_CONNECTION_LIMIT", str((os.cpu_count() or 1) * 2 + 1)))
+        self.DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.DB_SOCKET_TIMEOUT = int(os.getenv("DB_SOCKET_TIMEOUT", "10"))
 
         # Telegram
         self.TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
+        # Receive updates via webhook (POST /api/webhook) instead of polling
+        self.USE_WEBHOOK = os.getenv("USE_WEBHOOK", "false").lower() in ("true", "1", "t")
+        self.WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")  # Public base URL of this app
+        self.WEBHOOK_SECRET: Optional[str] = os.getenv("WEBHOOK_SECRET") or None
 
-        # API Keys
-        self.COINGECKO_API_KEY = os.getenv("COINGECKO_API_KEY", "")
-        self.CRYPTOPANIC_API_KEY = os.getenv("CRYPTOPANIC_API_KEY", "")
-        self.NEWS_API_KEY = os.getenv("NEWS_API_KEY")
-        self.COINDESK_API_KEY = os.getenv("COINDESK_API_KEY")
+        # API Keys (all optional; unset or empty values become None)
+        self.COINGECKO_API_KEY: Optional[str] = os.getenv("COINGECKO_API_KEY") or None
+        self.CRYPTOPANIC_API_KEY: Optional[str] = os.getenv("CRYPTOPANIC_API_KEY") or None
+        self.NEWS_API_KEY: Optional[str] = os.getenv("NEWS_API_KEY") or None
+        self.COINDESK_API_KEY: Optional[str] = os.getenv("COINDESK_API_KEY") or None
 
         # Validate required settings
         if not self.APP_SECRET_KEY:
@@ -37,15 +46,30 @@ class Environment:
         if not self.DATABASE_URL:
             raise ValueError("DATABASE_URL must be set in .env file")
 
+        self.DATABASE_URL = self._with_pool_params(self.DATABASE_URL)
+
         if not self.TELEGRAM_BOT_TOKEN:
             raise ValueError("TELEGRAM_BOT_TOKEN must be set in .env file")
 
-    def __getattr__(self, name: str) -> Any:
-        """Allow accessing attributes with dot notation"""
-        try:
-            return self.__dict__[name]
-        except KeyError:
-            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+        if self.USE_WEBHOOK and not self.WEBHOOK_URL:
+            raise ValueError("WEBHOOK_URL must be set in .env file when USE_WEBHOOK is enabled")
+
+        self._frozen = True
+
+    def _with_pool_params(self, url: str) -> str:
+        """Append Prisma connection pool settings unless the URL already sets them"""
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query))
+        query.setdefault("connection_limit", str(self.DB_CONNECTION_LIMIT))
+        query.setdefault("pool_timeout", str(self.DB_POOL_TIMEOUT))
+        query.setdefault("socket_timeout", str(self.DB_SOCKET_TIMEOUT))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Settings are read-only once loaded"""
+        if self.__dict__.get("_frozen"):
+            raise AttributeError(f"'{self.__class__.__name__}' object is read-only")
+        super().__setattr__(name, value)
 
-# Create a single instance of the environment
+# Create a single instance of the environment; import this rather than re-instantiating
 env = Environment()
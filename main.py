@@ -1,18 +1,43 @@
+from contextlib import asynccontextmanager
+import asyncio
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 import uvicorn
 
 from app.core.logging import setup_logging
-from app.api.routes import router as api_router
+from app.api.routes import router as api_router, health
 from app.core.telegram import bot_instance
+from app.core.db import db
 from env import env
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("Starting up Crypto News Bot...")
+    # Open the database connection (reused for the app lifetime) during the bot's
+    # service warm-up; the bot waits for it before handling any updates
+    await bot_instance.initialize(ready=db.connect())
+    logger.info("Database connection established")
+
+    yield
+
+    logger.info("Shutting down Crypto News Bot...")
+    # A slow or failing teardown on one side must not block the other
+    results = await asyncio.gather(bot_instance.shutdown(), db.disconnect(), return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Error during shutdown: {result}")
+    logger.info("Database connection closed")
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Crypto News Bot API",
     description="API for Crypto News Telegram Bot",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Setup CORS
@@ -29,30 +54,8 @@ setup_logging()
 
 # Include API routes
 app.include_router(api_router, prefix="/api")
-
-@app.on_event("startup")
-async def startup_event():
-    logger.info("Starting up Crypto News Bot...")
-    # Initialize database connection
-    from app.core.db import db
-    await db.connect()
-    logger.info("Database connection established")
-    
-    # Initialize bot
-    await bot_instance.initialize()
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("Shutting down Crypto News Bot...")
-    await bot_instance.shutdown()
-    # Close database connection
-    from app.core.db import db
-    await db.disconnect()
-    logger.info("Database connection closed")
-
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy"}
+# Serve the same health check at the root path used by probes
+app.include_router(health.router, prefix="/health", tags=["health"])
 
 if __name__ == "__main__":
     uvicorn.run(